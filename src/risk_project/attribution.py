@@ -0,0 +1,302 @@
+# src/attribution.py
+
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, Tuple
+from risk_project.config import P_VAR, HORIZON_DAYS, TRADING_DAYS_YR, MC_PATHS, SEED
+
+# Columns of every attribution table, in order
+ATTRIBUTION_COLUMNS = [
+    "exposure",
+    "marginal_var", "component_var", "incremental_var",
+    "marginal_es",  "component_es",  "incremental_es",
+]
+
+def _exposures(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series]
+) -> np.ndarray:
+    # dollar value held in each ticker at the last price (signed; no
+    # division by the net value, which is zero for dollar-neutral books)
+    syms        = list(positions.keys())
+    last_prices = np.array([price_series[s].iloc[-1] for s in syms], dtype=float)
+    holdings    = np.array([positions[s] for s in syms], dtype=float)
+    return holdings * last_prices
+
+def _horizon_moments(
+    syms: list,
+    mu_ann: Dict[str, float],
+    cov_ann: pd.DataFrame,
+    horizon_days: int,
+    trading_days: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    # annual → daily → horizon scaling, as in var_es
+    mu_h  = np.array([mu_ann[s] / trading_days for s in syms]) * horizon_days
+    cov_h = cov_ann.loc[syms, syms].values / trading_days * horizon_days
+    return mu_h, cov_h
+
+def _table(syms: list, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    return pd.DataFrame(columns, index=pd.Index(syms, name="symbol"))[ATTRIBUTION_COLUMNS]
+
+def parametric_attribution(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series],
+    mu_ann: Dict[str, float],
+    cov_ann: pd.DataFrame,
+    p: float = P_VAR,
+    horizon_days: int = HORIZON_DAYS,
+    trading_days: int = TRADING_DAYS_YR
+) -> pd.DataFrame:
+    """
+    Analytic marginal, component and incremental VaR/ES under normality.
+
+    With dollar exposures x, VaR = -x·μ - z·σ_p and ES = -x·μ + σ_p·φ(z)/(1-p),
+    where σ_p = sqrt(x'Σx) and z = Φ⁻¹(1-p).  Marginal risk is the gradient
+    with respect to x (e.g. -μ_i - z·(Σx)_i/σ_p for VaR) and component risk is
+    x_i times marginal, so components sum to `parametric_var_es` for long,
+    short and dollar-neutral books alike.
+
+    Parameters
+    ----------
+    positions : dict[str, float]
+        Number of shares held for each ticker (negative for shorts).
+    price_series : dict[str, pd.Series]
+        Historical price series for each ticker.
+    mu_ann : dict[str, float]
+        Annualized drifts for each ticker.
+    cov_ann : pd.DataFrame
+        Annualized covariance matrix among tickers.
+    p : float, default 0.99
+        Confidence level for VaR and ES.
+    horizon_days : int, default 1
+        Holding period in days.
+    trading_days : int, default 252
+        Trading days per year.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker with columns `ATTRIBUTION_COLUMNS`.  Marginal
+        figures are per $1 of exposure; incremental figures are the drop in
+        portfolio risk when the position is removed entirely.
+    """
+    syms       = list(positions.keys())
+    x          = _exposures(positions, price_series)
+    mu_h, cov_h = _horizon_moments(syms, mu_ann, cov_ann, horizon_days, trading_days)
+
+    z      = NormalDist().inv_cdf(1 - p)
+    k_es   = NormalDist().pdf(z) / (1 - p)
+
+    def risk(expo):
+        sigma = np.sqrt(expo.dot(cov_h).dot(expo))
+        mean  = expo.dot(mu_h)
+        return -mean - z * sigma, -mean + k_es * sigma
+
+    sigma_p = np.sqrt(x.dot(cov_h).dot(x))
+    beta    = cov_h.dot(x) / sigma_p       # ∂σ_p/∂x
+    m_var   = -mu_h - z * beta
+    m_es    = -mu_h + k_es * beta
+
+    var, es = risk(x)
+    inc_var = np.empty(len(syms))
+    inc_es  = np.empty(len(syms))
+    for i in range(len(syms)):
+        x_wo = x.copy()
+        x_wo[i] = 0.0
+        var_wo, es_wo = risk(x_wo)
+        inc_var[i] = var - var_wo
+        inc_es[i]  = es - es_wo
+
+    return _table(syms, {
+        "exposure":        x,
+        "marginal_var":    m_var,
+        "component_var":   x * m_var,
+        "incremental_var": inc_var,
+        "marginal_es":     m_es,
+        "component_es":    x * m_es,
+        "incremental_es":  inc_es,
+    })
+
+def scenario_attribution(
+    pnl: np.ndarray,
+    exposures: np.ndarray,
+    syms: list,
+    p: float = P_VAR,
+    var_bandwidth: float = 0.0025
+) -> pd.DataFrame:
+    """
+    Euler VaR/ES attribution from one set of P&L scenarios.
+
+    Component ES is the mean position loss over the scenarios whose portfolio
+    loss is at or beyond VaR, so it sums exactly to the scenario ES.
+    Component VaR is the mean position loss over the scenarios ranked within
+    `var_bandwidth` of the VaR order statistic, rescaled to sum to VaR.
+    Incremental figures re-rank the same scenarios with each position removed,
+    so no further simulation is needed.
+
+    Parameters
+    ----------
+    pnl : np.ndarray
+        (n_scenarios, n_assets) dollar P&L of each position per scenario.
+    exposures : np.ndarray
+        Dollar exposure of each position (used for marginal figures).
+    syms : list
+        Ticker for each column of `pnl`.
+    p : float, default 0.99
+        Confidence level for VaR and ES.
+    var_bandwidth : float, default 0.0025
+        Share of scenarios on each side of the VaR quantile averaged for
+        component VaR (at least one scenario).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker with columns `ATTRIBUTION_COLUMNS`.  Marginal
+        figures are component / exposure (NaN for zero exposure).
+
+    Raises
+    ------
+    ValueError
+        If `pnl` is not 2-D or its width does not match `syms`.
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    if pnl.ndim != 2 or pnl.shape[1] != len(syms):
+        raise ValueError(f"pnl must have shape (n_scenarios, {len(syms)})")
+    exposures = np.asarray(exposures, dtype=float)
+
+    pos_losses = -pnl
+    losses     = pos_losses.sum(axis=1)
+    n          = len(losses)
+
+    var   = np.quantile(losses, p)
+    tail  = losses >= var
+    es    = losses[tail].mean()
+    c_es  = pos_losses[tail].mean(axis=0)
+
+    # scenarios around the VaR order statistic
+    order = np.argsort(losses, kind="stable")
+    k     = int(round(p * (n - 1)))
+    h     = max(1, int(round(var_bandwidth * n)))
+    near  = order[max(0, k - h) : min(n, k + h + 1)]
+    c_var = pos_losses[near].mean(axis=0)
+    total = c_var.sum()
+    if total != 0.0:
+        c_var = c_var * (var / total)
+
+    # portfolio without each position, on the same scenarios
+    losses_wo = losses[:, None] - pos_losses
+    var_wo    = np.quantile(losses_wo, p, axis=0)
+    tail_wo   = losses_wo >= var_wo
+    es_wo     = (losses_wo * tail_wo).sum(axis=0) / tail_wo.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m_var = np.where(exposures != 0.0, c_var / exposures, np.nan)
+        m_es  = np.where(exposures != 0.0, c_es / exposures, np.nan)
+
+    return _table(list(syms), {
+        "exposure":        exposures,
+        "marginal_var":    m_var,
+        "component_var":   c_var,
+        "incremental_var": var - var_wo,
+        "marginal_es":     m_es,
+        "component_es":    c_es,
+        "incremental_es":  es - es_wo,
+    })
+
+def historical_attribution(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series],
+    p: float = P_VAR,
+    horizon_days: int = HORIZON_DAYS,
+    var_bandwidth: float = 0.0025
+) -> pd.DataFrame:
+    """
+    Euler VaR/ES attribution on historical P&L scenarios.
+
+    Scenarios are each position's horizon P&L (shares × price change) on
+    the dates where every ticker is priced at both ends; other dates are
+    dropped.  `historical_var_es` instead sums the book value skipping
+    missing prices, and clips gains at zero, so the two agree only on
+    aligned prices (e.g. from `align_price_series`) with positive tail
+    losses.  Gains are not clipped here so that components stay additive.
+
+    Parameters
+    ----------
+    positions : dict[str, float]
+        Number of shares held for each ticker.
+    price_series : dict[str, pd.Series]
+        Historical price series for each ticker.
+    p : float, default 0.99
+        Confidence level for VaR and ES.
+    horizon_days : int, default 1
+        Holding period in days.
+    var_bandwidth : float, default 0.0025
+        See `scenario_attribution`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker with columns `ATTRIBUTION_COLUMNS`.
+    """
+    syms   = list(positions.keys())
+    df     = pd.DataFrame({s: price_series[s] for s in syms})
+    pnl_df = df.diff(periods=horizon_days).multiply(pd.Series(positions)).dropna()
+    return scenario_attribution(
+        pnl_df[syms].values, _exposures(positions, price_series), syms,
+        p=p, var_bandwidth=var_bandwidth
+    )
+
+def monte_carlo_attribution(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series],
+    mu_ann: Dict[str, float],
+    cov_ann: pd.DataFrame,
+    p: float = P_VAR,
+    horizon_days: int = HORIZON_DAYS,
+    n_sims: int = MC_PATHS,
+    trading_days: int = TRADING_DAYS_YR,
+    seed: int = SEED,
+    var_bandwidth: float = 0.0025
+) -> pd.DataFrame:
+    """
+    Euler VaR/ES attribution from a single multivariate-normal simulation.
+
+    Draws the same scenarios as `monte_carlo_var_es` for a given seed, so
+    the components add up to its VaR and ES.
+
+    Parameters
+    ----------
+    positions : dict[str, float]
+        Number of shares held per ticker.
+    price_series : dict[str, pd.Series]
+        Historical price series per ticker.
+    mu_ann : dict[str, float]
+        Annualized drifts.
+    cov_ann : pd.DataFrame
+        Annualized covariance.
+    p : float, default 0.99
+        Confidence level.
+    horizon_days : int, default 1
+        Holding period in days.
+    n_sims : int, default 10000
+        Number of Monte Carlo trials.
+    trading_days : int, default 252
+        Trading days per year.
+    seed : int | None
+        RNG seed for reproducibility.
+    var_bandwidth : float, default 0.0025
+        See `scenario_attribution`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker with columns `ATTRIBUTION_COLUMNS`.
+    """
+    rng         = np.random.default_rng(seed)
+    syms        = list(positions.keys())
+    x           = _exposures(positions, price_series)
+    mu_h, cov_h = _horizon_moments(syms, mu_ann, cov_ann, horizon_days, trading_days)
+
+    sims = rng.multivariate_normal(mu_h, cov_h, size=n_sims)
+    return scenario_attribution(sims * x, x, syms, p=p, var_bandwidth=var_bandwidth)
@@ -1,7 +1,12 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2, norm
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+from risk_project.config import (
+    P_VAR, HORIZON_DAYS, WINDOW, TRADING_DAYS_YR, MC_PATHS, SEED, CHECKPOINT_EVERY
+)
+from risk_project.calibration import estimate_mu_sigma, estimate_covariance_matrix
+from risk_project.var_es import parametric_var_es, historical_var_es, monte_carlo_var_es
+from risk_project.results_store import BacktestStore, RECORD_DTYPE, price_chain
 
 def compute_portfolio_pnl(
     series: Dict[str, pd.Series],
@@ -80,6 +85,9 @@ def kupiec_test(
     p_value : float
         p‐value from chi‐square(1) test.
     """
+    # imported here so the rest of the module loads without scipy.stats
+    from scipy.stats import chi2
+
     # perfect fit
     if n_exceptions == 0 or n_exceptions == n_obs:
         return 0.0, 1.0
@@ -96,3 +104,163 @@ def kupiec_test(
     lr_stat = 2.0 * (l1 - l0)
     p_value = 1.0 - chi2.cdf(lr_stat, df=1)
     return lr_stat, p_value
+
+
+BACKTEST_METHODS = ("parametric", "historical", "monte_carlo")
+
+# part of the store parameters: bump when an estimator's output changes so
+# results stored by older code are recomputed rather than reused
+# (2: parametric VaR/ES on dollar exposures, correct for short books)
+MODEL_VERSION = 2
+
+def _risk_on_window(
+    hist: pd.DataFrame,
+    positions: Dict[str, float],
+    method: str,
+    p: float,
+    horizon_days: int,
+    trading_days: int,
+    n_sims: int,
+    seed: Optional[int]
+) -> Tuple[float, float, float, float]:
+    # calibrate on the window, then VaR/ES plus portfolio horizon moments
+    syms   = list(positions.keys())
+    series = {s: hist[s] for s in syms}
+    mu_ann = {
+        s: estimate_mu_sigma(series[s], trading_days_per_year=trading_days)[0]
+        for s in syms
+    }
+    cov_ann = estimate_covariance_matrix(series, trading_days_per_year=trading_days)
+
+    if method == "parametric":
+        var, es = parametric_var_es(positions, series, mu_ann, cov_ann,
+                                    p, horizon_days, trading_days)
+    elif method == "historical":
+        var, es = historical_var_es(positions, series, p, horizon_days)
+    else:
+        var, es = monte_carlo_var_es(positions, series, mu_ann, cov_ann,
+                                     p, horizon_days, n_sims, trading_days, seed)
+
+    x      = np.array([positions[s] * hist[s].iloc[-1] for s in syms])
+    mu_h   = np.array([mu_ann[s] for s in syms]) / trading_days * horizon_days
+    cov_h  = cov_ann.loc[syms, syms].values / trading_days * horizon_days
+    return var, es, x.dot(mu_h), np.sqrt(x.dot(cov_h).dot(x))
+
+
+def rolling_backtest(
+    price_df: pd.DataFrame,
+    positions: Dict[str, float],
+    method: str = "parametric",
+    p: float = P_VAR,
+    horizon_days: int = HORIZON_DAYS,
+    window: int = WINDOW,
+    trading_days: int = TRADING_DAYS_YR,
+    n_sims: int = MC_PATHS,
+    seed: Optional[int] = SEED,
+    store_dir: Optional[str] = None,
+    portfolio: str = "portfolio",
+    checkpoint_every: int = CHECKPOINT_EVERY
+) -> pd.DataFrame:
+    """
+    Rolling-window VaR/ES backtest, optionally resumed from a results store.
+
+    The forecast for date t is calibrated on the `window` prices ending
+    `horizon_days` before t and compared with the realized P&L over the
+    horizon ending at t (for a 1-day horizon: ``price_df.iloc[t-window:t]``).
+
+    With `store_dir`, results are kept in a `BacktestStore` file.  Stored
+    dates whose input data (every row up to that date, see `price_chain`)
+    and parameters are unchanged are reused; only the remaining dates are
+    computed, and they are checkpointed every `checkpoint_every` dates so an
+    interrupted run resumes where it stopped.
+
+    Parameters
+    ----------
+    price_df : pd.DataFrame
+        Aligned prices with no missing values (columns = tickers).
+    positions : dict[str, float]
+        Share counts per ticker.
+    method : {"parametric", "historical", "monte_carlo"}, default "parametric"
+        VaR/ES estimator.
+    p : float, default 0.99
+        Confidence level.
+    horizon_days : int, default 1
+        Holding period.
+    window : int, default 250
+        Rolling window length.
+    trading_days : int, default 252
+        Trading days per year.
+    n_sims : int, default 10000
+        Monte Carlo trials (``"monte_carlo"`` only).
+    seed : int | None, default 42
+        RNG seed (``"monte_carlo"`` only); the same seed is used each date.
+    store_dir : str, optional
+        Directory of the results store; no persistence if omitted.
+    portfolio : str, default "portfolio"
+        Portfolio name, part of the store key.
+    checkpoint_every : int, default 250
+        Dates computed between durable checkpoints.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by date with columns var, es, pnl, exception, port_mu and
+        port_sigma (calibrated horizon mean and std-dev of portfolio P&L).
+
+    Raises
+    ------
+    ValueError
+        If `method` is unknown.
+    """
+    if method not in BACKTEST_METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {BACKTEST_METHODS}")
+
+    syms    = list(positions.keys())
+    prices  = price_df[syms]
+    dates   = (pd.DatetimeIndex(prices.index).values
+               .astype("datetime64[ns]").view(np.int64))
+    chain   = price_chain(prices)
+    first   = window + horizon_days - 1
+    targets = np.arange(first, len(prices))
+    holdings = np.array([positions[s] for s in syms])
+    values   = prices.to_numpy(dtype=np.float64)
+
+    store = None
+    done  = np.empty(0, dtype=RECORD_DTYPE)
+    if store_dir is not None:
+        store = BacktestStore(store_dir, portfolio, method, p, horizon_days, window)
+        done  = store.open({
+            "symbols":      syms,
+            "positions":    [float(positions[s]) for s in syms],
+            "trading_days": trading_days,
+            "n_sims":       n_sims if method == "monte_carlo" else None,
+            "seed":         seed if method == "monte_carlo" else None,
+            "model":        MODEL_VERSION,
+        })
+        # keep the longest prefix that still matches dates and input data
+        m    = min(len(done), len(targets))
+        bad  = ((done["date"][:m] != dates[targets[:m]]) |
+                (done["chain"][:m] != chain[targets[:m]]))
+        keep = int(np.argmax(bad)) if bad.any() else m
+        if keep < len(done):
+            store.truncate(keep)
+            done = done[:keep]
+
+    todo  = targets[len(done):]
+    parts = [done]
+    for start in range(0, len(todo), max(1, checkpoint_every)):
+        batch = todo[start : start + max(1, checkpoint_every)]
+        recs  = np.zeros(len(batch), dtype=RECORD_DTYPE)
+        for j, t in enumerate(batch):
+            end  = t - horizon_days + 1
+            hist = prices.iloc[end - window : end]
+            var, es, mu_p, sigma_p = _risk_on_window(
+                hist, positions, method, p, horizon_days, trading_days, n_sims, seed
+            )
+            pnl = holdings.dot(values[t] - values[t - horizon_days])
+            recs[j] = (dates[t], chain[t], var, es, pnl, -pnl > var, mu_p, sigma_p)
+        if store is not None:
+            store.append(recs)
+        parts.append(recs)
+
+    return BacktestStore.to_frame(np.concatenate(parts))
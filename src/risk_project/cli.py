@@ -0,0 +1,280 @@
+# src/cli.py
+"""
+Batch risk runner: ``risk-batch JOBS.json [-o results.csv|results.json]``.
+
+Only the standard library is imported at module level so that ``--help`` and
+job-file validation start instantly; numpy/pandas and the risk modules are
+imported once there are jobs to run, and scipy.stats is never needed for
+parametric, historical or Monte Carlo VaR/ES.
+
+Job file (JSON)::
+
+    {
+      "files":  ["data/AAPL-bloomberg.csv", "data/AMZN-bloomberg.csv"],
+      "missing_data_policy": "drop",
+      "window": 250,
+      "portfolios": {
+        "equal":  {"notional": {"AAPL": 100000, "AMZN": 100000}},
+        "apple":  {"shares":   {"AAPL": 500}}
+      },
+      "jobs": [
+        {"portfolio": "equal", "methods": ["parametric", "historical"],
+         "p": [0.99, 0.975], "horizons": [1, 5]},
+        {"portfolio": "apple", "methods": ["monte_carlo"], "p": 0.999,
+         "rel_tol": 0.01}
+      ]
+    }
+
+`files`, `missing_data_policy` and `window` default to the values in
+`risk_project.config`; relative `files` are resolved against the job file's
+directory; a job's `p` and `horizons` default to P_VAR and
+HORIZON_DAYS.  Monte Carlo jobs also accept `n_sims`, `seed`, `rel_tol`,
+`abs_tol`, `batch_size` and `max_paths`.
+"""
+
+import os
+import sys
+import csv
+import time
+import json
+import argparse
+from typing import Any, Dict, List, Optional
+
+
+def _process_age() -> float:
+    # seconds since this process started, so that `startup_s` includes
+    # interpreter start-up and imports; Linux only (10 ms resolution),
+    # elsewhere the clock starts when this module is imported
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+# process start on the perf_counter clock
+_T0 = time.perf_counter() - _process_age()
+
+METHODS = ("parametric", "historical", "monte_carlo")
+_MC_OPTIONS = ("n_sims", "seed", "rel_tol", "abs_tol", "batch_size", "max_paths")
+
+RESULT_FIELDS = [
+    "portfolio", "method", "p", "horizon_days", "as_of", "n_obs",
+    "var", "es", "n_paths", "var_se", "es_se", "elapsed_ms",
+]
+
+
+def _as_list(value: Any) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def load_job_file(path: str) -> Dict[str, Any]:
+    """
+    Read and validate a job file (see module docstring).
+
+    Returns
+    -------
+    dict
+        The parsed spec, with `files` made absolute and every job's
+        `methods`, `p` and `horizons` normalised to lists (None where the
+        config default applies).
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file cannot be opened.
+    ValueError
+        If the JSON is malformed, a job is not an object, or it refers to
+        unknown portfolios/methods.
+    """
+    with open(path) as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON ({e})") from None
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+
+    portfolios = spec.get("portfolios")
+    if not isinstance(portfolios, dict) or not portfolios:
+        raise ValueError(f"{path}: 'portfolios' must be a non-empty object")
+    for name, pf in portfolios.items():
+        if not isinstance(pf, dict) or len(set(pf) & {"shares", "notional"}) != 1:
+            raise ValueError(f"portfolio {name!r}: give exactly one of 'shares' or 'notional'")
+
+    if "files" in spec:
+        files = spec["files"]
+        if not isinstance(files, list) or not all(isinstance(f, str) for f in files):
+            raise ValueError(f"{path}: 'files' must be a list of paths")
+        base = os.path.dirname(os.path.abspath(path))
+        spec["files"] = [os.path.normpath(os.path.join(base, f)) for f in files]
+
+    jobs = spec.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError(f"{path}: 'jobs' must be a non-empty list")
+    for i, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            raise ValueError(f"job {i}: expected an object, got {job!r}")
+        if job.get("portfolio") not in portfolios:
+            raise ValueError(f"job {i}: unknown portfolio {job.get('portfolio')!r}")
+        job["methods"] = _as_list(job.get("methods", ["parametric"]))
+        bad = [m for m in job["methods"] if m not in METHODS]
+        if bad:
+            raise ValueError(f"job {i}: unknown method(s) {bad}; expected {list(METHODS)}")
+        job["p"]        = _as_list(job["p"]) if "p" in job else None
+        job["horizons"] = _as_list(job["horizons"]) if "horizons" in job else None
+    return spec
+
+
+def run_jobs(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Run every (portfolio, method, p, horizon) combination in a job spec.
+
+    Prices are loaded and aligned once, and each portfolio is calibrated
+    once on the trailing `window` prices; all methods then share that data.
+
+    Returns
+    -------
+    list[dict]
+        One result row per combination, keyed by `RESULT_FIELDS`.
+    """
+    # deferred: these pull in numpy and pandas
+    from risk_project import config
+    from risk_project.data_loader import load_price_series, align_price_series
+    from risk_project.calibration import estimate_mu_sigma, estimate_covariance_matrix
+    from risk_project.var_es import (
+        parametric_var_es, historical_var_es, monte_carlo_var_es, monte_carlo_var_es_adaptive
+    )
+
+    files    = spec.get("files", config.STOCK_FILES)
+    policy   = spec.get("missing_data_policy", config.MISSING_DATA_POLICY)
+    window   = spec.get("window", config.WINDOW)
+    td       = spec.get("trading_days", config.TRADING_DAYS_YR)
+    price_df = align_price_series(load_price_series(files), policy=policy)
+    if window is not None:
+        price_df = price_df.iloc[-window:]
+    as_of = price_df.index[-1].date().isoformat()
+
+    calibrated = {}
+    rows = []
+    for job in spec["jobs"]:
+        name = job["portfolio"]
+        if name not in calibrated:
+            pf = spec["portfolios"][name]
+            if "shares" in pf:
+                positions = dict(pf["shares"])
+            else:
+                positions = {s: n / price_df[s].iloc[-1] for s, n in pf["notional"].items()}
+            missing = [s for s in positions if s not in price_df.columns]
+            if missing:
+                raise ValueError(f"portfolio {name!r}: no price data for {missing}")
+            series = {s: price_df[s] for s in positions}
+            mu_ann = {
+                s: estimate_mu_sigma(series[s], trading_days_per_year=td)[0]
+                for s in positions
+            }
+            cov_ann = estimate_covariance_matrix(series, trading_days_per_year=td)
+            calibrated[name] = (positions, series, mu_ann, cov_ann)
+        positions, series, mu_ann, cov_ann = calibrated[name]
+
+        mc_opts = {k: job[k] for k in _MC_OPTIONS if k in job}
+        for method in job["methods"]:
+            for p in job["p"] or [config.P_VAR]:
+                for h in job["horizons"] or [config.HORIZON_DAYS]:
+                    t = time.perf_counter()
+                    row = {"portfolio": name, "method": method, "p": p,
+                           "horizon_days": h, "as_of": as_of, "n_obs": len(price_df)}
+                    if method == "parametric":
+                        var, es = parametric_var_es(positions, series, mu_ann, cov_ann,
+                                                    p, h, td)
+                    elif method == "historical":
+                        var, es = historical_var_es(positions, series, p, h)
+                    else:
+                        opts = {k: v for k, v in mc_opts.items() if v is not None}
+                        opts.setdefault("seed", config.SEED)
+                        if "rel_tol" in opts or "abs_tol" in opts:
+                            opts.pop("n_sims", None)
+                            res = monte_carlo_var_es_adaptive(
+                                positions, series, mu_ann, cov_ann, p, h,
+                                trading_days=td, **opts)
+                            var, es = res.var, res.es
+                            row.update(n_paths=res.n_paths, var_se=float(res.var_se),
+                                       es_se=float(res.es_se))
+                        else:
+                            for k in ("batch_size", "max_paths"):
+                                opts.pop(k, None)
+                            var, es = monte_carlo_var_es(positions, series, mu_ann, cov_ann,
+                                                         p, h, trading_days=td, **opts)
+                            row["n_paths"] = opts.get("n_sims", config.MC_PATHS)
+                    row.update(var=float(var), es=float(es),
+                               elapsed_ms=round(1e3 * (time.perf_counter() - t), 3))
+                    rows.append(row)
+    return rows
+
+
+def write_results(rows: List[Dict[str, Any]], path: Optional[str], fmt: str) -> None:
+    """Write result rows as CSV or JSON to `path` (stdout if None)."""
+    out = open(path, "w", newline="") if path else sys.stdout
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+    finally:
+        if path:
+            out.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="risk-batch",
+        description="Run batch VaR/ES jobs from a JSON job file.",
+    )
+    parser.add_argument("job_file", help="JSON file listing portfolios and jobs")
+    parser.add_argument("-o", "--output",
+                        help="output file (.csv or .json); stdout if omitted")
+    parser.add_argument("-f", "--format", choices=("csv", "json"),
+                        help="output format (default: from --output extension, else json)")
+    parser.add_argument("--timings", action="store_true",
+                        help="print startup/run timings and loaded heavy modules to stderr")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point; returns the process exit status."""
+    parser = build_parser()
+    args   = parser.parse_args(argv)
+    fmt    = args.format or ("csv" if (args.output or "").endswith(".csv") else "json")
+
+    t_start = time.perf_counter()
+    try:
+        spec = load_job_file(args.job_file)
+        t_loaded = time.perf_counter()
+        rows = run_jobs(spec)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"risk-batch: error: {e}", file=sys.stderr)
+        return 1
+    t_run = time.perf_counter()
+    write_results(rows, args.output, fmt)
+
+    if args.timings:
+        timings = {
+            "startup_s": round(t_start - _T0, 6),
+            "job_file_s": round(t_loaded - t_start, 6),
+            "run_s":     round(t_run - t_loaded, 6),
+            "total_s":   round(time.perf_counter() - _T0, 6),
+            "jobs":      len(rows),
+            "pandas_loaded": "pandas" in sys.modules,
+            "scipy_stats_loaded": "scipy.stats" in sys.modules,
+        }
+        print(json.dumps(timings), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
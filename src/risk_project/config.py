@@ -7,6 +7,11 @@ STOCK_FILES = [
     "data/AMZN-bloomberg.csv",
 ]
 
+# ─── Missing-data handling ─────────────────────────────────────────────────
+# How to align series on a common calendar: "drop", "ffill" or "raise"
+MISSING_DATA_POLICY = "drop"
+FFILL_LIMIT         = 5   # max consecutive days to forward-fill under "ffill"
+
 # ─── Portfolio sizing ──────────────────────────────────────────────────────
 # Dollars you intend to allocate to each symbol
 TARGET_NOTIONAL = 100_000
@@ -27,6 +32,11 @@ WINDOW = 250
 MC_PATHS = 10_000  # number of simulated paths in Monte Carlo
 SEED     = 42      # RNG seed for reproducibility
 
+# Adaptive mode (pass rel_tol/abs_tol): simulate in batches until the
+# standard error of VaR/ES meets the tolerance or the path budget runs out
+MC_BATCH_PATHS = 5_000      # paths per batch
+MC_MAX_PATHS   = 1_000_000  # path budget
+
 # ─── Trading calendar ─────────────────────────────────────────────────────
 # Trading days per year (used to annualize/inverse‐annualize)
 TRADING_DAYS_YR = 252
@@ -36,6 +46,11 @@ TRADING_DAYS_YR = 252
 BACKTEST_START = None  # e.g. "2000-01-01"
 BACKTEST_END   = None  # e.g. "2024-05-01"
 
+# ─── Backtest results store ───────────────────────────────────────────────
+# Directory for checkpointed rolling backtest results (see results_store.py)
+RESULTS_DIR      = "results"
+CHECKPOINT_EVERY = 250  # dates computed between durable checkpoints
+
 # ── Option‐pricing parameters ───────────────────────────────────────────────────
 # Annual continuously‐compounded risk‐free rate (e.g. 2%)
 RISK_FREE_RATE   = 0.02
@@ -1,6 +1,7 @@
 # src/data_loader.py
 import pandas as pd
 from typing import List, Dict
+from risk_project.config import MISSING_DATA_POLICY, FFILL_LIMIT
 
 def load_price_series(files: List[str]) -> Dict[str, pd.Series]:
     """
@@ -31,3 +32,77 @@ def load_price_series(files: List[str]) -> Dict[str, pd.Series]:
         symbol = f.split('/')[-1].replace('-bloomberg.csv','')
         series[symbol] = df['PX_LAST'].sort_index()
     return series
+
+
+def align_price_series(
+    series: Dict[str, pd.Series],
+    policy: str = MISSING_DATA_POLICY,
+    ffill_limit: int = FFILL_LIMIT
+) -> pd.DataFrame:
+    """
+    Align price series on a common trading calendar.
+
+    Parameters
+    ----------
+    series : dict[str, pd.Series]
+        Mapping ticker -> price series (e.g. from `load_price_series`).
+    policy : {"drop", "ffill", "raise"}, default "drop"
+        How to treat dates missing from some series:
+
+        * ``"drop"``  – keep only dates on which every ticker has a price
+          (same as ``pd.DataFrame(series).dropna()``).
+        * ``"ffill"`` – use the union calendar and carry the last price
+          forward over gaps of at most `ffill_limit` days; longer gaps are
+          not filled at all, and dates that are still incomplete (e.g.
+          before a ticker's first print) are dropped.
+        * ``"raise"`` – raise if the calendars disagree anywhere on their
+          common date range.
+    ffill_limit : int, default 5
+        Longest run of missing days to forward-fill (``"ffill"`` only).
+
+    A date repeated within one series keeps its last price.
+
+    Returns
+    -------
+    pd.DataFrame
+        Prices with columns = tickers, indexed by a sorted, unique date index
+        with no missing values.
+
+    Raises
+    ------
+    ValueError
+        If `policy` is unknown, the calendars disagree under ``"raise"``,
+        no common dates remain, or any price is non-positive.
+    """
+    if policy not in ("drop", "ffill", "raise"):
+        raise ValueError(f"unknown missing-data policy {policy!r}")
+
+    # repeated dates within a series keep their last price; they must go
+    # before the frame is built, which cannot align duplicate labels
+    series   = {s: ser[~ser.index.duplicated(keep="last")] for s, ser in series.items()}
+    price_df = pd.DataFrame(series).sort_index()
+
+    if policy == "ffill":
+        # fill whole gaps of <= ffill_limit days only (ffill(limit=) would
+        # also fill the first days of a longer gap)
+        missing = price_df.isna()
+        run_id  = (~missing).cumsum()
+        run_len = missing.apply(lambda col: col.groupby(run_id[col.name]).transform("sum"))
+        fill    = missing & (run_len <= ffill_limit)
+        price_df = price_df.where(~fill, price_df.ffill())
+    elif policy == "raise":
+        start = max(s.first_valid_index() for s in series.values())
+        end   = min(s.last_valid_index() for s in series.values())
+        common = price_df.loc[start:end]
+        if common.isna().any().any():
+            gaps = common.index[common.isna().any(axis=1)]
+            raise ValueError(
+                f"{len(gaps)} dates missing from some series, first {gaps[0].date()}"
+            )
+
+    price_df = price_df.dropna()
+    if price_df.empty:
+        raise ValueError("no common dates across price series")
+    if (price_df <= 0).any().any():
+        raise ValueError("prices must be strictly positive")
+    return price_df
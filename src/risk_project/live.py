@@ -0,0 +1,585 @@
+# src/live.py
+"""
+Live risk service: VaR/ES that updates as price bars arrive.
+
+Bars come from Bloomberg-format CSV files that are appended to (see
+`tail_bloomberg_csv`) or from a local TCP socket taking one
+``SYMBOL,<Bloomberg CSV row>`` line per bar (see `serve_bar_socket`).  Every
+bar updates an aligned price window and a rolling calibration in O(n²); the
+first bar of a new date opens a new row (other tickers carry their last
+price forward), later bars for the same date revise it.
+
+Recomputation of parametric and historical VaR/ES for every registered
+portfolio is coalesced: bursts of bars trigger one recompute, which runs in
+an executor (a process pool by default) so the event loop never blocks.  The
+latest numbers and latency percentiles are served as JSON over HTTP:
+
+    GET /risk      current VaR/ES per portfolio and method
+    GET /latency   bar-to-result latency and compute-time percentiles (ms)
+    GET /health    liveness and counters
+"""
+
+import os
+import sys
+import json
+import signal
+import time
+import asyncio
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from risk_project.config import (
+    P_VAR, HORIZON_DAYS, WINDOW, TRADING_DAYS_YR, TARGET_NOTIONAL, STOCK_FILES,
+    MISSING_DATA_POLICY, FFILL_LIMIT
+)
+from risk_project.var_es import parametric_var_es, historical_var_es
+
+Bar = Tuple[str, date, float]
+
+# smallest price window: 2 returns are needed to calibrate a covariance
+MIN_WINDOW = 3
+
+
+class RollingCalibration:
+    """
+    Rolling annualized drift vector and covariance matrix of log returns.
+
+    Keeps running sums of the last `capacity` return vectors and their outer
+    products, so adding, dropping or revising a return costs O(n²).  The
+    results match `estimate_mu_sigma` / `estimate_covariance_matrix` on the
+    same window.  Sums are rebuilt from the stored returns every `capacity`
+    updates to stop floating-point drift.
+    """
+
+    def __init__(self, n_assets: int, capacity: int, trading_days: int = TRADING_DAYS_YR):
+        self.capacity     = capacity
+        self.trading_days = trading_days
+        self._rets        = deque()
+        self._s1          = np.zeros(n_assets)
+        self._s2          = np.zeros((n_assets, n_assets))
+        self._updates     = 0
+
+    def __len__(self) -> int:
+        return len(self._rets)
+
+    def _tick(self) -> None:
+        self._updates += 1
+        if self._updates >= self.capacity:
+            arr = np.array(self._rets)
+            self._s1 = arr.sum(axis=0)
+            self._s2 = arr.T.dot(arr)
+            self._updates = 0
+
+    def push(self, ret: np.ndarray) -> None:
+        """Add the newest return vector, dropping the oldest when full."""
+        ret = np.asarray(ret, dtype=float)
+        if len(self._rets) == self.capacity:
+            old = self._rets.popleft()
+            self._s1 -= old
+            self._s2 -= np.outer(old, old)
+        self._rets.append(ret)
+        self._s1 += ret
+        self._s2 += np.outer(ret, ret)
+        self._tick()
+
+    def replace_last(self, ret: np.ndarray) -> None:
+        """Revise the newest return vector (intraday update of today's bar)."""
+        ret = np.asarray(ret, dtype=float)
+        old = self._rets[-1]
+        self._rets[-1] = ret
+        self._s1 += ret - old
+        self._s2 += np.outer(ret, ret) - np.outer(old, old)
+        self._tick()
+
+    def estimate(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annualized drift vector and covariance matrix.
+
+        Raises
+        ------
+        ValueError
+            If fewer than 2 returns are held.
+        """
+        m = len(self._rets)
+        if m < 2:
+            raise ValueError("need at least 2 returns to calibrate")
+        mean = self._s1 / m
+        cov  = (self._s2 - m * np.outer(mean, mean)) / (m - 1)
+        return mean * self.trading_days, cov * self.trading_days
+
+
+def compute_portfolio_risk(task: dict) -> Dict[str, Dict[str, float]]:
+    """
+    Parametric and historical VaR/ES for one portfolio (runs in a worker).
+
+    `task` holds plain arrays so it pickles cheaply: symbols, dates, prices
+    (window rows), mu_ann, cov_ann, positions, p, horizon_days, trading_days.
+    """
+    syms   = task["symbols"]
+    index  = pd.DatetimeIndex(task["dates"])
+    prices = pd.DataFrame(task["prices"], index=index, columns=syms)
+    pos    = task["positions"]
+    series = {s: prices[s] for s in pos}
+    mu_ann = dict(zip(syms, task["mu_ann"]))
+    cov    = pd.DataFrame(task["cov_ann"], index=syms, columns=syms)
+
+    var_p, es_p = parametric_var_es(pos, series, mu_ann, cov, task["p"],
+                                    task["horizon_days"], task["trading_days"])
+    var_h, es_h = historical_var_es(pos, series, task["p"], task["horizon_days"])
+    return {
+        "parametric": {"var": float(var_p), "es": float(es_p)},
+        "historical": {"var": float(var_h), "es": float(es_h)},
+    }
+
+
+def _percentiles(values) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    arr = np.array(values) * 1e3
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"count": len(arr), "p50": float(p50), "p90": float(p90),
+            "p99": float(p99), "max": float(arr.max())}
+
+
+class LiveRiskService:
+    """
+    Keeps VaR/ES for registered portfolios current as price bars arrive.
+
+    Parameters
+    ----------
+    symbols : list[str]
+        Tickers carried in the price window.
+    window : int, default 250
+        Number of aligned prices used for calibration and historical VaR
+        (at least `MIN_WINDOW`).
+    p : float, default 0.99
+        Confidence level.
+    horizon_days : int, default 1
+        Holding period.
+    trading_days : int, default 252
+        Trading days per year.
+    executor : concurrent.futures.Executor, optional
+        Where recomputation runs; a spawn-based process pool with `workers`
+        processes is created (and shut down by `close`) if omitted.
+    workers : int, default 1
+        Pool size when no executor is given.
+    coalesce_ms : float, default 20
+        Quiet period after a bar before recomputing, so that a burst of bars
+        triggers a single recompute.
+    max_delay_ms : float, default 200
+        Upper bound on that wait, so a steady stream of bars cannot starve
+        recomputation.
+    request_timeout_ms : float, default 5000
+        Time an HTTP client has to send its request headers before the
+        connection is dropped.
+
+    Raises
+    ------
+    ValueError
+        If `window` is smaller than `MIN_WINDOW`.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        window: int = WINDOW,
+        p: float = P_VAR,
+        horizon_days: int = HORIZON_DAYS,
+        trading_days: int = TRADING_DAYS_YR,
+        executor: Optional[Executor] = None,
+        workers: int = 1,
+        coalesce_ms: float = 20.0,
+        max_delay_ms: float = 200.0,
+        request_timeout_ms: float = 5000.0
+    ):
+        if window < MIN_WINDOW:
+            raise ValueError(f"window must be at least {MIN_WINDOW}, got {window}")
+        self.symbols      = list(symbols)
+        self.window       = window
+        self.p            = p
+        self.horizon_days = horizon_days
+        self.trading_days = trading_days
+        self.coalesce_s   = coalesce_ms / 1e3
+        self.max_delay_s  = max_delay_ms / 1e3
+        self.request_timeout_s = request_timeout_ms / 1e3
+
+        self._own_executor = executor is None
+        self._executor     = executor or ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._col         = {s: j for j, s in enumerate(self.symbols)}
+        self._dates       = deque(maxlen=window)
+        self._prices      = deque(maxlen=window)
+        self._calib       = RollingCalibration(len(self.symbols), window - 1, trading_days)
+        self._portfolios  = {}
+
+        self._dirty       = asyncio.Event()
+        self._first_bar_t = None
+        self._latency     = deque(maxlen=1000)
+        self._compute     = deque(maxlen=1000)
+        self.results      = {}
+        self.as_of        = None
+        self.n_bars       = 0
+        self.n_stale      = 0
+        self.n_recomputes = 0
+        self.last_error   = None
+
+    # ── state ───────────────────────────────────────────────────────────
+    def register_portfolio(self, name: str, positions: Dict[str, float]) -> None:
+        """Add or replace a portfolio (share counts per ticker)."""
+        unknown = [s for s in positions if s not in self._col]
+        if unknown:
+            raise ValueError(f"portfolio {name!r}: unknown symbols {unknown}")
+        self._portfolios[name] = dict(positions)
+        self._mark_dirty()
+
+    def seed(self, price_df: pd.DataFrame) -> None:
+        """
+        Load history (aligned prices, e.g. from `align_price_series`);
+        only the last `window` rows are kept.
+        """
+        hist = price_df[self.symbols].iloc[-self.window:]
+        for ts, row in zip(hist.index, hist.to_numpy(dtype=float)):
+            self._append_row(pd.Timestamp(ts).date(), row)
+        self._mark_dirty()
+
+    def _append_row(self, d: date, row: np.ndarray) -> None:
+        if self._prices:
+            self._calib.push(np.log(row / self._prices[-1]))
+        self._dates.append(d)
+        self._prices.append(row)
+
+    def on_bar(self, symbol: str, d: date, price: float) -> None:
+        """
+        Apply one price bar.  Bars for unknown symbols, non-positive prices
+        or dates before the current row are counted as stale and ignored.
+        """
+        col = self._col.get(symbol)
+        if col is None or not price > 0 or (self._dates and d < self._dates[-1]):
+            self.n_stale += 1
+            return
+        self.n_bars += 1
+
+        if self._dates and d == self._dates[-1]:
+            row = self._prices[-1].copy()
+            row[col] = price
+            self._prices[-1] = row
+            if len(self._prices) > 1:
+                self._calib.replace_last(np.log(row / self._prices[-2]))
+        else:
+            if not self._prices:
+                self.n_stale += 1
+                return          # nothing to carry other tickers forward from
+            row = self._prices[-1].copy()
+            row[col] = price
+            self._append_row(d, row)
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        if self._first_bar_t is None:
+            self._first_bar_t = time.perf_counter()
+        self._dirty.set()
+
+    def _tasks(self) -> List[Tuple[str, dict]]:
+        mu_ann, cov_ann = self._calib.estimate()
+        dates  = np.array(self._dates, dtype="datetime64[D]")
+        prices = np.array(self._prices)
+        return [
+            (name, {
+                "symbols": self.symbols, "dates": dates, "prices": prices,
+                "mu_ann": mu_ann, "cov_ann": cov_ann, "positions": pos,
+                "p": self.p, "horizon_days": self.horizon_days,
+                "trading_days": self.trading_days,
+            })
+            for name, pos in self._portfolios.items()
+        ]
+
+    # ── recomputation ───────────────────────────────────────────────────
+    async def recompute(self) -> None:
+        """Recompute every portfolio now, off the event loop."""
+        t_bar, self._first_bar_t = self._first_bar_t, None
+        self._dirty.clear()
+        if not self._portfolios or len(self._calib) < 2:
+            return
+        as_of = self._dates[-1]
+        loop  = asyncio.get_running_loop()
+        tasks = self._tasks()
+        t0    = time.perf_counter()
+        outs  = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, compute_portfolio_risk, task)
+            for _, task in tasks
+        ))
+        done = time.perf_counter()
+        self.results = {name: out for (name, _), out in zip(tasks, outs)}
+        self.as_of   = as_of
+        self.n_recomputes += 1
+        self._compute.append(done - t0)
+        if t_bar is not None:
+            self._latency.append(done - t_bar)
+
+    async def run_recompute_loop(self) -> None:
+        """Recompute whenever bars have arrived, coalescing bursts."""
+        while True:
+            await self._dirty.wait()
+            # let the burst settle: restart the quiet period on every new bar
+            deadline = time.perf_counter() + self.max_delay_s
+            while time.perf_counter() < deadline:
+                self._dirty.clear()
+                await asyncio.sleep(self.coalesce_s)
+                if not self._dirty.is_set():
+                    break
+            try:
+                await self.recompute()
+            except Exception as e:      # keep serving the last good numbers
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    async def consume(self, feed: AsyncIterator[Bar]) -> None:
+        """Apply every bar from an async feed."""
+        async for symbol, d, price in feed:
+            self.on_bar(symbol, d, price)
+
+    # ── reporting ───────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        """Current VaR/ES per portfolio and method."""
+        return {
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "p": self.p,
+            "horizon_days": self.horizon_days,
+            "portfolios": self.results,
+        }
+
+    def latency_stats(self) -> dict:
+        """Bar-to-result latency and compute-time percentiles, in ms."""
+        return {"latency_ms": _percentiles(self._latency),
+                "compute_ms": _percentiles(self._compute)}
+
+    def health(self) -> dict:
+        return {
+            "bars": self.n_bars, "stale_bars": self.n_stale,
+            "recomputes": self.n_recomputes, "pending": self._dirty.is_set(),
+            "window_rows": len(self._prices), "last_error": self.last_error,
+        }
+
+    async def _read_request_line(self, reader: asyncio.StreamReader) -> bytes:
+        # request line; the headers are read and ignored
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        return request
+
+    async def _handle_http(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await asyncio.wait_for(self._read_request_line(reader),
+                                                 self.request_timeout_s)
+            except asyncio.TimeoutError:
+                return          # slow or idle client: drop the connection
+            parts  = request.decode("latin-1").split()
+            path   = parts[1].split("?")[0] if len(parts) >= 2 else ""
+            routes = {"/risk": self.snapshot, "/latency": self.latency_stats,
+                      "/health": self.health}
+            if parts and parts[0] != "GET":
+                status, body = "405 Method Not Allowed", {"error": "GET only"}
+            elif path in routes:
+                status, body = "200 OK", routes[path]()
+            else:
+                status, body = "404 Not Found", {"error": f"no route {path!r}"}
+            payload = json.dumps(body).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+                .encode() + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Start the JSON endpoint (port 0 picks a free port)."""
+        return await asyncio.start_server(self._handle_http, host, port)
+
+    def close(self, wait: bool = False) -> None:
+        """Shut down the executor if the service created it."""
+        if not self._own_executor:
+            return
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+        else:
+            self._executor.shutdown(wait=wait)
+
+
+# ─── Feeds ─────────────────────────────────────────────────────────────────
+def parse_bloomberg_row(line: str) -> Optional[Tuple[date, float]]:
+    """
+    (date, PX_LAST) from a ``Dates,PX_LAST,...`` CSV row; None for the header,
+    blank lines or rows without a price.
+    """
+    fields = line.strip().split(",")
+    if len(fields) < 2 or not fields[1]:
+        return None
+    try:
+        return datetime.strptime(fields[0], "%m/%d/%Y").date(), float(fields[1])
+    except ValueError:
+        return None
+
+
+def _line_start(path: str, offset: int, chunk: int = 4096) -> int:
+    # byte position of the start of the line containing `offset`
+    with open(path, "rb") as f:
+        end = offset
+        while end > 0:
+            begin = max(0, end - chunk)
+            f.seek(begin)
+            nl = f.read(end - begin).rfind(b"\n")
+            if nl >= 0:
+                return begin + nl + 1
+            end = begin
+    return 0
+
+
+async def tail_bloomberg_csv(
+    path: str,
+    symbol: str,
+    poll_interval: float = 0.05,
+    from_start: bool = False,
+    offset: Optional[int] = None
+) -> AsyncIterator[Bar]:
+    """
+    Yield bars for rows appended to a Bloomberg CSV (like ``tail -f``).
+
+    Only complete lines are parsed; a partially written row is held back
+    until its newline arrives.  By default, existing rows are skipped;
+    `offset` (e.g. the file size when history was loaded) starts from that
+    byte instead, rewound to the start of its line so no row is lost.
+    """
+    with open(path, "r") as f:
+        if offset is not None:
+            f.seek(_line_start(path, offset))
+        elif not from_start:
+            f.seek(0, 2)
+        buf = ""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            buf += chunk
+            if not buf.endswith("\n"):
+                continue
+            parsed = parse_bloomberg_row(buf)
+            buf = ""
+            if parsed is not None:
+                yield (symbol,) + parsed
+
+
+async def serve_bar_socket(
+    service: LiveRiskService,
+    host: str = "127.0.0.1",
+    port: int = 8766
+) -> asyncio.AbstractServer:
+    """
+    Accept bars over TCP, one ``SYMBOL,<Bloomberg CSV row>`` line each.
+    """
+    async def handle(reader, writer):
+        try:
+            async for line in reader:
+                symbol, _, row = line.decode().partition(",")
+                parsed = parse_bloomberg_row(row)
+                if parsed is not None:
+                    service.on_bar(symbol.strip(), *parsed)
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+# ─── Entry point ───────────────────────────────────────────────────────────
+async def _run(args: argparse.Namespace) -> None:
+    from risk_project.data_loader import load_price_series, align_price_series
+
+    # tail from where each file ended before seeding, so rows appended while
+    # the history loads are not skipped (a re-read row is a same-date
+    # revision or a stale bar)
+    offsets  = [os.path.getsize(f) for f in args.files]
+    series   = load_price_series(args.files)
+    price_df = align_price_series(series, policy=args.missing_data_policy,
+                                  ffill_limit=args.ffill_limit)
+    service  = LiveRiskService(list(price_df.columns), window=args.window, p=args.p,
+                               horizon_days=args.horizon, workers=args.workers)
+    service.seed(price_df)
+    service.register_portfolio("default", {
+        s: TARGET_NOTIONAL / price_df[s].iloc[-1] for s in price_df.columns
+    })
+
+    http  = await service.serve_http(args.host, args.port)
+    tasks = [asyncio.ensure_future(service.run_recompute_loop())]
+    for f, sym, offset in zip(args.files, series, offsets):
+        tasks.append(asyncio.ensure_future(
+            service.consume(tail_bloomberg_csv(f, sym, offset=offset))))
+    servers = [http]
+    if args.feed_port is not None:
+        servers.append(await serve_bar_socket(service, args.host, args.feed_port))
+
+    # stop cleanly on SIGINT/SIGTERM so the worker pool is shut down too
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass    # e.g. Windows event loops
+    print(f"serving http://{args.host}:{args.port}/risk", file=sys.stderr)
+    try:
+        await stop.wait()
+    finally:
+        for server in servers:
+            server.close()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        service.close(wait=True)
+
+
+def _window_arg(value: str) -> int:
+    window = int(value)
+    if window < MIN_WINDOW:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_WINDOW}")
+    return window
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point: tail CSV files and serve live VaR/ES."""
+    parser = argparse.ArgumentParser(
+        prog="risk-live", description="Serve live VaR/ES as Bloomberg CSVs are appended."
+    )
+    parser.add_argument("files", nargs="*", default=STOCK_FILES,
+                        help="Bloomberg CSV files to seed from and tail")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP/JSON port")
+    parser.add_argument("--feed-port", type=int, help="also accept bars on this TCP port")
+    parser.add_argument("--missing-data-policy", choices=("drop", "ffill", "raise"),
+                        default=MISSING_DATA_POLICY,
+                        help="how to align the seed history (see align_price_series)")
+    parser.add_argument("--ffill-limit", type=int, default=FFILL_LIMIT)
+    parser.add_argument("--window", type=_window_arg, default=WINDOW)
+    parser.add_argument("--p", type=float, default=P_VAR)
+    parser.add_argument("--horizon", type=int, default=HORIZON_DAYS)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
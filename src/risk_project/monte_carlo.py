@@ -2,8 +2,234 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
 from risk_project.calibration import estimate_mu_sigma, estimate_covariance_matrix
+from risk_project.config import MC_BATCH_PATHS, MC_MAX_PATHS
+
+# two-sided 95% normal quantile, used for order-statistic intervals
+_Z95 = 1.959963984540054
+
+
+class MCEstimate(NamedTuple):
+    """
+    Result of an adaptive Monte Carlo run.
+
+    var, es : float
+        VaR and ES estimated from all simulated paths.
+    n_paths : int
+        Number of paths simulated.
+    var_se, es_se : float
+        Estimated standard errors of `var` and `es` (inf if the tail is
+        too thin to estimate them).
+    converged : bool
+        True if the tolerance was met before the path budget ran out.
+    """
+    var: float
+    es: float
+    n_paths: int
+    var_se: float
+    es_se: float
+    converged: bool
+
+
+def tail_standard_errors(
+    losses: np.ndarray,
+    p: float
+) -> Tuple[float, float, float, float]:
+    """
+    VaR and ES of a loss sample together with their standard errors.
+
+    The VaR error comes from the distribution-free 95% order-statistic
+    interval for the p-quantile (half-width / 1.96).  The ES error uses the
+    asymptotic variance of the tail mean,
+    (Var[L | L >= VaR] + p·(ES - VaR)²) / (n·(1-p)).
+
+    Parameters
+    ----------
+    losses : np.ndarray
+        Simulated losses.
+    p : float
+        Confidence level.
+
+    Returns
+    -------
+    var, es, var_se, es_se : float
+    """
+    losses = np.asarray(losses, dtype=float)
+    return _tail_stats(np.sort(losses), len(losses), p)
+
+
+def _tail_size(n: int, p: float) -> int:
+    # largest losses needed by _tail_stats for a sample of n (VaR ranks,
+    # the lower order-statistic bound and everything above them)
+    half = _Z95 * np.sqrt(n * p * (1.0 - p))
+    return min(n, int(np.ceil(n * (1.0 - p) + half)) + 4)
+
+
+def _tail_stats(
+    top: np.ndarray,
+    n: int,
+    p: float
+) -> Tuple[float, float, float, float]:
+    # top: the len(top) largest of n losses, sorted ascending; matches
+    # np.quantile (linear) and the tail mean on the full sample
+    offset = n - len(top)
+
+    def order_stat(rank):
+        return top[rank - offset]
+
+    pos  = p * (n - 1)
+    i    = int(np.floor(pos))
+    frac = pos - i
+    var  = order_stat(i)
+    if frac > 0.0:
+        var = var + frac * (order_stat(i + 1) - var)
+    tail = top[np.searchsorted(top, var, side="left"):]
+    es   = tail.mean()
+
+    half = _Z95 * np.sqrt(n * p * (1.0 - p))
+    lo   = int(np.floor(n * p - half)) - 1
+    hi   = int(np.ceil(n * p + half)) - 1
+    if lo < 0 or hi > n - 1 or len(tail) < 2:
+        return var, es, np.inf, np.inf
+    var_se = (order_stat(hi) - order_stat(lo)) / (2.0 * _Z95)
+    es_se  = np.sqrt((tail.var(ddof=1) + p * (es - var) ** 2) / (n * (1.0 - p)))
+    return var, es, var_se, es_se
+
+
+def adaptive_tail_estimate(
+    draw_losses: Callable[[int], np.ndarray],
+    p: float,
+    rel_tol: Optional[float] = None,
+    abs_tol: Optional[float] = None,
+    batch_size: int = MC_BATCH_PATHS,
+    max_paths: int = MC_MAX_PATHS,
+    target: str = "both"
+) -> MCEstimate:
+    """
+    Simulate losses in batches until VaR/ES are precise enough.
+
+    After each batch the standard errors are re-estimated on all paths so
+    far (as in `tail_standard_errors`, but from the retained upper tail
+    only); simulation stops once every targeted error
+    is at most ``max(abs_tol, rel_tol * |estimate|)`` or `max_paths` is hit.
+
+    Parameters
+    ----------
+    draw_losses : callable
+        ``draw_losses(n)`` returns `n` new simulated losses.
+    p : float
+        Confidence level.
+    rel_tol : float, optional
+        Target standard error relative to the estimate.
+    abs_tol : float, optional
+        Target standard error in loss units.
+    batch_size : int, default 5000
+        Paths per batch.
+    max_paths : int, default 1000000
+        Path budget.
+    target : {"both", "var", "es"}, default "both"
+        Which estimates must meet the tolerance.
+
+    Returns
+    -------
+    MCEstimate
+
+    Raises
+    ------
+    ValueError
+        If neither tolerance is given, `target` is unknown, or `batch_size`
+        or `max_paths` is not positive.
+    """
+    if rel_tol is None and abs_tol is None:
+        raise ValueError("adaptive Monte Carlo needs rel_tol and/or abs_tol")
+    if target not in ("both", "var", "es"):
+        raise ValueError(f"unknown target {target!r}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if max_paths < 1:
+        raise ValueError(f"max_paths must be positive, got {max_paths}")
+
+    # keep only the largest losses that any path count up to max_paths can
+    # need, so each batch costs O(batch_size + tail) rather than O(n)
+    keep = _tail_size(max_paths, p)
+    top  = np.empty(0)
+    n = 0
+    while True:
+        size = min(batch_size, max_paths - n)
+        top  = np.concatenate([top, np.asarray(draw_losses(size), dtype=float)])
+        if len(top) > keep:
+            top = np.partition(top, len(top) - keep)[-keep:]
+        top.sort()
+        n += size
+        var, es, var_se, es_se = _tail_stats(top, n, p)
+
+        checks = {"var": (var, var_se), "es": (es, es_se)}
+        names  = ("var", "es") if target == "both" else (target,)
+        ok = all(
+            checks[k][1] <= max(abs_tol or 0.0, (rel_tol or 0.0) * abs(checks[k][0]))
+            for k in names
+        )
+        if ok or n >= max_paths:
+            return MCEstimate(var, es, n, var_se, es_se, ok)
+
+
+def _rolling_loss_sampler(
+    price_df: pd.DataFrame,
+    positions: Dict[str, float],
+    idx: int,
+    is_long: bool,
+    horizon_days: int,
+    window: int,
+    trading_days: int,
+    seed: Optional[int]
+) -> Callable[[int], np.ndarray]:
+    # calibrate on the window ending at idx; returns draw_losses(n)
+    if idx < window:
+        raise IndexError(f"idx {idx} < window {window}")
+    # 1) historical slice
+    hist = price_df.iloc[idx-window : idx]
+
+    # 2) annual μ & Σ on that slice
+    mu_ann = {
+        s: estimate_mu_sigma(hist[s], trading_days_per_year=trading_days)[0]
+        for s in hist.columns
+    }
+    cov_ann = estimate_covariance_matrix(
+        {s: hist[s] for s in hist.columns},
+        trading_days_per_year=trading_days
+    )
+
+    # 3) convert to daily & horizon
+    syms     = list(positions.keys())
+    mu_daily = np.array([mu_ann[s]/trading_days for s in syms])
+    cov_daily= cov_ann.loc[syms,syms]/trading_days
+    mu_h     = mu_daily * horizon_days
+    cov_h    = cov_daily.values * horizon_days
+
+    # 4) portfolio weighting & V0 at date idx
+    last_prices = np.array([price_df[s].iloc[idx] for s in syms])
+    holdings    = np.array([positions[s] for s in syms])
+    values      = holdings * last_prices
+    V0          = values.sum()
+    w           = values / V0
+    rng         = np.random.default_rng(seed)
+
+    def draw_losses(n):
+        # simulate log-returns, shape (n, n_assets)
+        sims = rng.multivariate_normal(mu_h, cov_h, size=n)
+
+        # portfolio log-return sims → discrete returns → P&L
+        port_log_rets = sims.dot(w)                # each sim’s log-return
+        port_discrete = np.expm1(port_log_rets)    # exp(log) - 1
+        pnl_sims      = port_discrete * V0
+
+        # define losses & clip negatives for longs
+        raw_losses = -pnl_sims if is_long else pnl_sims
+        return np.clip(raw_losses, a_min=0.0, a_max=None)
+
+    return draw_losses
+
 
 def monte_carlo(
     price_df: pd.DataFrame,
@@ -56,50 +282,51 @@ def monte_carlo(
     ValueError
         If idx < window or DataFrame too small.
     """
-    if idx < window:
-        raise IndexError(f"idx {idx} < window {window}")
-    # 1) historical slice
-    hist = price_df.iloc[idx-window : idx]
-
-    # 2) annual μ & Σ on that slice
-    mu_ann = {
-        s: estimate_mu_sigma(hist[s], trading_days_per_year=trading_days)[0]
-        for s in hist.columns
-    }
-    cov_ann = estimate_covariance_matrix(
-        {s: hist[s] for s in hist.columns},
-        trading_days_per_year=trading_days
+    draw_losses = _rolling_loss_sampler(
+        price_df, positions, idx, is_long, horizon_days, window, trading_days, seed
     )
 
-    # 3) convert to daily & horizon
-    syms     = list(positions.keys())
-    mu_daily = np.array([mu_ann[s]/trading_days for s in syms])
-    cov_daily= cov_ann.loc[syms,syms]/trading_days
-    mu_h     = mu_daily * horizon_days
-    cov_h    = cov_daily.values * horizon_days
-
-    # 4) simulate log-returns
-    rng  = np.random.default_rng(seed)
-    sims = rng.multivariate_normal(mu_h, cov_h, size=n_sims)  # shape (n_sims, n_assets)
+    # 5) VaR or ES
+    losses = draw_losses(n_sims)
+    var = np.quantile(losses, p)
+    es  = losses[losses >= var].mean()
 
-    # 5) portfolio weighting & V0 at date idx
-    last_prices = np.array([price_df[s].iloc[idx] for s in syms])
-    holdings    = np.array([positions[s] for s in syms])
-    values      = holdings * last_prices
-    V0          = values.sum()
-    w           = values / V0
+    return var if is_var else es
 
-    # 6) portfolio log-return sims → discrete returns → P&L
-    port_log_rets = sims.dot(w)                # each sim’s log-return
-    port_discrete = np.expm1(port_log_rets)    # exp(log) - 1
-    pnl_sims      = port_discrete * V0
 
-    # 7) define losses & clip negatives for longs
-    raw_losses = -pnl_sims if is_long else pnl_sims
-    losses     = np.clip(raw_losses, a_min=0.0, a_max=None)
+def monte_carlo_adaptive(
+    price_df: pd.DataFrame,
+    positions: Dict[str, float],
+    idx: int,
+    is_long: bool,
+    is_var: bool,
+    p: float,
+    horizon_days: int,
+    window: int,
+    trading_days: int,
+    seed: int = None,
+    rel_tol: Optional[float] = None,
+    abs_tol: Optional[float] = None,
+    batch_size: int = MC_BATCH_PATHS,
+    max_paths: int = MC_MAX_PATHS
+) -> MCEstimate:
+    """
+    `monte_carlo` with an adaptive path count.
 
-    # 8) VaR or ES
-    var = np.quantile(losses, p)
-    es  = losses[losses >= var].mean()
+    Paths are simulated in batches of `batch_size` until the standard error
+    of the requested measure (VaR if `is_var`, else ES) meets `rel_tol` /
+    `abs_tol` or `max_paths` is hit; see `adaptive_tail_estimate`.  The other
+    parameters are as in `monte_carlo`.
 
-    return var if is_var else es
+    Returns
+    -------
+    MCEstimate
+        VaR, ES, paths used and achieved standard errors at date index `idx`.
+    """
+    draw_losses = _rolling_loss_sampler(
+        price_df, positions, idx, is_long, horizon_days, window, trading_days, seed
+    )
+    return adaptive_tail_estimate(
+        draw_losses, p, rel_tol, abs_tol, batch_size, max_paths,
+        target="var" if is_var else "es"
+    )
@@ -0,0 +1,190 @@
+# src/results_store.py
+
+import os
+import re
+import json
+import struct
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+# ─── File format ───────────────────────────────────────────────────────────
+# header : MAGIC | version (u2) | params length (u4) | params JSON
+# body   : fixed-size RECORD_DTYPE records, one per backtest date, appended
+MAGIC          = b"RPBT"
+FORMAT_VERSION = 1
+_HEADER_PREFIX = struct.Struct("<4sHI")
+
+RECORD_DTYPE = np.dtype([
+    ("date",       "<i8"),   # datetime64[ns] as int64
+    ("chain",      "<u8"),   # hash of all input rows up to this date
+    ("var",        "<f8"),
+    ("es",         "<f8"),
+    ("pnl",        "<f8"),   # realized horizon P&L ending on this date
+    ("exception",  "u1"),    # 1 if loss > VaR
+    ("port_mu",    "<f8"),   # calibrated horizon mean P&L ($)
+    ("port_sigma", "<f8"),   # calibrated horizon P&L std-dev ($)
+])
+
+
+def price_chain(price_df: pd.DataFrame) -> np.ndarray:
+    """
+    Running fingerprint of a price table, one value per row.
+
+    Entry i hashes the dates and prices of rows 0..i, so results computed
+    from data up to row i stay valid exactly as long as entry i is unchanged
+    (appending rows leaves earlier entries alone; revising a row changes
+    every later entry).
+
+    Parameters
+    ----------
+    price_df : pd.DataFrame
+        Prices with columns = tickers (in the order used for the backtest).
+
+    Returns
+    -------
+    np.ndarray
+        uint64 fingerprint per row.
+    """
+    dates  = (pd.DatetimeIndex(price_df.index).values
+              .astype("datetime64[ns]").view(np.int64))
+    values = np.ascontiguousarray(price_df.to_numpy(dtype=np.float64))
+    out    = np.empty(len(price_df), dtype=np.uint64)
+    prev   = b""
+    for i in range(len(price_df)):
+        h = hashlib.blake2b(prev, digest_size=8)
+        h.update(dates[i].tobytes())
+        h.update(values[i].tobytes())
+        prev   = h.digest()
+        out[i] = int.from_bytes(prev, "little")
+    return out
+
+
+class BacktestStore:
+    """
+    Append-only binary store of rolling VaR/ES backtest results.
+
+    One file per (portfolio, method, p, horizon, window) key.  The header
+    records the remaining parameters (positions, seed, ...); opening the
+    store with different parameters discards the old results.  Records are
+    only ever appended, except that `truncate` drops a stale tail when the
+    input data was revised.
+
+    A record is either fully on disk or ignored: a partial record left by an
+    interrupted write is cut off when the store is next opened.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        portfolio: str,
+        method: str,
+        p: float,
+        horizon_days: int,
+        window: int
+    ):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", portfolio)
+        self.path = os.path.join(
+            root, f"{safe}__{method}__p{p:g}__h{horizon_days}__w{window}.rpbt"
+        )
+        self._header_size: Optional[int] = None
+
+    def _read_params(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                prefix = f.read(_HEADER_PREFIX.size)
+                if len(prefix) < _HEADER_PREFIX.size:
+                    return None
+                magic, version, n = _HEADER_PREFIX.unpack(prefix)
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    return None
+                raw = f.read(n)
+                if len(raw) < n:
+                    return None
+                self._header_size = _HEADER_PREFIX.size + n
+                return json.loads(raw.decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # corrupt header (JSONDecodeError / UnicodeDecodeError): start over
+            return None
+
+    def _reset(self, params: Dict[str, Any]) -> None:
+        raw = json.dumps(params, sort_keys=True).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER_PREFIX.pack(MAGIC, FORMAT_VERSION, len(raw)))
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._header_size = _HEADER_PREFIX.size + len(raw)
+
+    def open(self, params: Dict[str, Any]) -> np.ndarray:
+        """
+        Open the store for `params` and return the valid records.
+
+        Parameters
+        ----------
+        params : dict
+            JSON-serialisable parameters that the results depend on.
+
+        Returns
+        -------
+        np.ndarray
+            Existing records (RECORD_DTYPE); empty if the file was missing,
+            unreadable or written with different parameters.
+        """
+        params = json.loads(json.dumps(params, sort_keys=True))
+        if self._read_params() != params:
+            self._reset(params)
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        size  = os.path.getsize(self.path) - self._header_size
+        whole = size // RECORD_DTYPE.itemsize
+        if whole * RECORD_DTYPE.itemsize != size:
+            # interrupted mid-record: drop the partial tail
+            self.truncate(whole)
+        return self.load()
+
+    def load(self) -> np.ndarray:
+        """Read all records."""
+        if self._header_size is None:
+            raise RuntimeError("store has not been opened")
+        return np.fromfile(self.path, dtype=RECORD_DTYPE, offset=self._header_size)
+
+    def append(self, records: np.ndarray) -> None:
+        """
+        Append records and fsync, making them a durable checkpoint.
+        """
+        if self._header_size is None:
+            raise RuntimeError("store has not been opened")
+        with open(self.path, "ab") as f:
+            f.write(np.asarray(records, dtype=RECORD_DTYPE).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def truncate(self, n_records: int) -> None:
+        """Keep only the first `n_records` records."""
+        if self._header_size is None:
+            raise RuntimeError("store has not been opened")
+        with open(self.path, "r+b") as f:
+            f.truncate(self._header_size + n_records * RECORD_DTYPE.itemsize)
+
+    @staticmethod
+    def to_frame(records: np.ndarray) -> pd.DataFrame:
+        """
+        Records as a DataFrame indexed by date (var, es, pnl, exception,
+        port_mu, port_sigma).
+        """
+        index = pd.DatetimeIndex(records["date"].view("datetime64[ns]"), name="date")
+        return pd.DataFrame({
+            "var":        records["var"],
+            "es":         records["es"],
+            "pnl":        records["pnl"],
+            "exception":  records["exception"].astype(bool),
+            "port_mu":    records["port_mu"],
+            "port_sigma": records["port_sigma"],
+        }, index=index)
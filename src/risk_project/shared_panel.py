@@ -0,0 +1,290 @@
+# src/shared_panel.py
+
+import sys
+import weakref
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from typing import Dict, NamedTuple, Optional, Tuple
+from risk_project.data_loader import align_price_series
+from risk_project.config import MISSING_DATA_POLICY, FFILL_LIMIT
+
+
+class PanelSpec(NamedTuple):
+    """
+    Picklable handle that lets another process attach to a shared panel.
+
+    Only the segment name and shape travel to workers; the dates, prices
+    and return matrices themselves stay in shared memory.
+    """
+    shm_name: str
+    symbols: Tuple[str, ...]
+    n_dates: int
+
+
+def _layout(n_dates: int, n_assets: int) -> Dict[str, Tuple[int, Tuple[int, ...]]]:
+    # all blocks are 8-byte items: offset (in items) and shape of each
+    n_rets = n_dates - 1
+    blocks = {}
+    offset = 0
+    for name, shape in (
+        ("dates",          (n_dates,)),
+        ("prices",         (n_dates, n_assets)),
+        ("log_returns",    (n_rets, n_assets)),
+        ("simple_returns", (n_rets, n_assets)),
+    ):
+        blocks[name] = (offset, shape)
+        offset += int(np.prod(shape))
+    blocks["_total"] = (offset, ())
+    return blocks
+
+
+def _release(shm: shared_memory.SharedMemory, owner: bool) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # a caller still holds a view; the mapping goes away with it
+        pass
+    finally:
+        if owner:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedReturnPanel:
+    """
+    Aligned prices plus log and simple return matrices in shared memory.
+
+    Build one in the parent with `SharedReturnPanel.create` (or
+    `from_series`), hand `panel.spec` to pool workers, and have them call
+    `SharedReturnPanel.attach(spec)` (or use `init_worker` as the pool
+    initializer).  Every process then reads the same pages through NumPy
+    views; nothing but the small `PanelSpec` is pickled.
+
+    The creating process owns the segment and unlinks it on `close()`,
+    on leaving a ``with`` block, or when the panel is garbage-collected.
+    Attached panels only unmap it, and their views are read-only.  Views obtained from a panel must not
+    be used after it is closed.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        spec: PanelSpec,
+        owner: bool
+    ):
+        self._shm  = shm
+        self.spec  = spec
+        self.owner = owner
+
+        blocks = _layout(spec.n_dates, len(spec.symbols))
+        views  = {}
+        for name in ("dates", "prices", "log_returns", "simple_returns"):
+            offset, shape = blocks[name]
+            dtype = np.int64 if name == "dates" else np.float64
+            views[name] = np.ndarray(
+                shape, dtype=dtype, buffer=shm.buf, offset=offset * 8
+            )
+            if not owner:
+                # a write from one worker would be seen by every process
+                views[name].setflags(write=False)
+        self._views = views
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+
+    # ── construction ────────────────────────────────────────────────────
+    @classmethod
+    def create(
+        cls,
+        price_df: pd.DataFrame,
+        name: Optional[str] = None
+    ) -> "SharedReturnPanel":
+        """
+        Copy an aligned price DataFrame into a new shared-memory segment.
+
+        Parameters
+        ----------
+        price_df : pd.DataFrame
+            Prices with columns = tickers, indexed by date, no missing values
+            (e.g. from `align_price_series`).
+        name : str, optional
+            Segment name; a random one is chosen if omitted.
+
+        Returns
+        -------
+        SharedReturnPanel
+            Owning panel with log and simple returns precomputed.
+
+        Raises
+        ------
+        ValueError
+            If fewer than 2 dates, missing values or non-positive prices.
+        """
+        if len(price_df) < 2:
+            raise ValueError("need at least 2 dates to compute returns")
+        prices = price_df.to_numpy(dtype=np.float64)
+        if np.isnan(prices).any():
+            raise ValueError("price_df contains missing values; align it first")
+        if (prices <= 0).any():
+            raise ValueError("prices must be strictly positive")
+
+        n_dates, n_assets = prices.shape
+        total = _layout(n_dates, n_assets)["_total"][0]
+        shm   = shared_memory.SharedMemory(name=name, create=True, size=total * 8)
+        spec  = PanelSpec(shm.name, tuple(str(c) for c in price_df.columns), n_dates)
+        try:
+            panel = cls(shm, spec, owner=True)
+        except Exception:
+            _release(shm, owner=True)
+            raise
+
+        v = panel._views
+        v["dates"][:]  = (
+            pd.DatetimeIndex(price_df.index).values
+            .astype("datetime64[ns]").view(np.int64)
+        )
+        v["prices"][:] = prices
+        np.log(prices[1:] / prices[:-1], out=v["log_returns"])
+        np.divide(prices[1:], prices[:-1], out=v["simple_returns"])
+        v["simple_returns"] -= 1.0
+        return panel
+
+    @classmethod
+    def from_series(
+        cls,
+        series: Dict[str, pd.Series],
+        policy: str = MISSING_DATA_POLICY,
+        ffill_limit: int = FFILL_LIMIT
+    ) -> "SharedReturnPanel":
+        """
+        Align loaded series (see `align_price_series`) and publish them.
+        """
+        return cls.create(align_price_series(series, policy, ffill_limit))
+
+    @classmethod
+    def attach(cls, spec: PanelSpec) -> "SharedReturnPanel":
+        """
+        Attach to a panel created in another process, without copying.
+
+        Parameters
+        ----------
+        spec : PanelSpec
+            The creating panel's `spec`.
+
+        Returns
+        -------
+        SharedReturnPanel
+            Non-owning panel; closing it leaves the segment in place.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the segment has already been unlinked.
+        TypeError
+            If the segment is too small for `spec`.
+        """
+        if sys.version_info >= (3, 13):
+            # the creator's resource tracker already accounts for the segment
+            shm = shared_memory.SharedMemory(name=spec.shm_name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=spec.shm_name)
+        try:
+            return cls(shm, spec, owner=False)
+        except Exception:
+            _release(shm, owner=False)
+            raise
+
+    # ── data access ─────────────────────────────────────────────────────
+    def _view(self, name: str) -> np.ndarray:
+        if not self._finalizer.alive:
+            raise ValueError("shared panel is closed")
+        return self._views[name]
+
+    @property
+    def symbols(self) -> Tuple[str, ...]:
+        return self.spec.symbols
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Trading calendar of `prices` (returns start at ``dates[1]``)."""
+        return pd.DatetimeIndex(self._view("dates").view("datetime64[ns]").copy())
+
+    @property
+    def prices(self) -> np.ndarray:
+        """
+        (n_dates, n_assets) view of aligned prices.  Writable only in the
+        creating panel, and writing does not update the return matrices.
+        """
+        return self._view("prices")
+
+    @property
+    def log_returns(self) -> np.ndarray:
+        """(n_dates - 1, n_assets) view of daily log returns."""
+        return self._view("log_returns")
+
+    @property
+    def simple_returns(self) -> np.ndarray:
+        """(n_dates - 1, n_assets) view of daily simple returns."""
+        return self._view("simple_returns")
+
+    def price_frame(self) -> pd.DataFrame:
+        """
+        Prices as a DataFrame (copied, so it stays valid after `close()`).
+        """
+        return pd.DataFrame(self.prices.copy(), index=self.dates,
+                            columns=list(self.symbols))
+
+    # ── lifecycle ───────────────────────────────────────────────────────
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """
+        Unmap the segment; the owning panel also unlinks it.  Idempotent.
+        """
+        self._views = {}
+        self._finalizer()
+
+    def __enter__(self) -> "SharedReturnPanel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        state = "closed" if self.closed else f"{self.spec.n_dates} dates"
+        return (f"SharedReturnPanel({self.spec.shm_name!r}, "
+                f"symbols={list(self.symbols)}, {state})")
+
+
+# ── pool worker helpers ─────────────────────────────────────────────────────
+_WORKER_PANEL: Optional[SharedReturnPanel] = None
+
+
+def init_worker(spec: PanelSpec) -> None:
+    """
+    Pool initializer: attach this worker to the shared panel once.
+
+    Use as ``Pool(initializer=init_worker, initargs=(panel.spec,))`` and
+    call `worker_panel()` inside tasks.
+    """
+    global _WORKER_PANEL
+    if _WORKER_PANEL is not None:
+        _WORKER_PANEL.close()
+    _WORKER_PANEL = SharedReturnPanel.attach(spec)
+
+
+def worker_panel() -> SharedReturnPanel:
+    """
+    Panel attached by `init_worker` in the current process.
+
+    Raises
+    ------
+    RuntimeError
+        If `init_worker` has not run in this process.
+    """
+    if _WORKER_PANEL is None:
+        raise RuntimeError("init_worker has not been called in this process")
+    return _WORKER_PANEL
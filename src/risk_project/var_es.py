@@ -2,9 +2,12 @@
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
-from typing import Dict, Tuple
-from risk_project.config import P_VAR, HORIZON_DAYS, TRADING_DAYS_YR, MC_PATHS, SEED
+from statistics import NormalDist
+from typing import Callable, Dict, Optional, Tuple
+from risk_project.config import (
+    P_VAR, HORIZON_DAYS, TRADING_DAYS_YR, MC_PATHS, SEED, MC_BATCH_PATHS, MC_MAX_PATHS
+)
+from risk_project.monte_carlo import MCEstimate, adaptive_tail_estimate
 
 def compute_weights(
     positions: Dict[str, float],
@@ -30,10 +33,14 @@ def parametric_var_es(
     """
     Compute parametric VaR and ES for a stock-only portfolio under normal assumption.
 
+    Works on dollar exposures x (shares × last price): VaR = -x·μ - z·σ and
+    ES = -x·μ + σ·φ(z)/(1-p) with σ = sqrt(x'Σx), so short and
+    dollar-neutral books are handled like long ones.
+
     Parameters
     ----------
     positions : dict[str, float]
-        Number of shares held for each ticker.
+        Number of shares held for each ticker (negative for shorts).
     price_series : dict[str, pd.Series]
         Historical price series for each ticker.
     mu_ann : dict[str, float]
@@ -59,8 +66,11 @@ def parametric_var_es(
     ValueError
         If any input dimensions mismatch.
     """
-    w, V0 = compute_weights(positions, price_series)
-    syms   = list(positions.keys())
+    # dollar exposures (not weights × V0, which breaks for net-short or
+    # dollar-neutral books where V0 ≤ 0)
+    syms        = list(positions.keys())
+    last_prices = np.array([price_series[s].iloc[-1] for s in syms], dtype=float)
+    x           = np.array([positions[s] for s in syms], dtype=float) * last_prices
 
     # annual → daily → horizon scaling
     mu_daily  = np.array([mu_ann[s] / trading_days for s in syms])
@@ -68,19 +78,17 @@ def parametric_var_es(
     mu_h      = mu_daily * horizon_days
     cov_h     = cov_daily.values * horizon_days
 
-    # portfolio moments
-    mu_p    = w.dot(mu_h)
-    sigma_p = np.sqrt(w.dot(cov_h).dot(w))
+    # dollar P&L moments
+    mu_p    = x.dot(mu_h)
+    sigma_p = np.sqrt(x.dot(cov_h).dot(x))
 
-    # VaR
-    z     = norm.ppf(1 - p)
-    var_r = -(mu_p + z * sigma_p)
-    var    = var_r * V0
+    # VaR (stdlib normal keeps scipy.stats off the import path)
+    z   = NormalDist().inv_cdf(1 - p)
+    var = -(mu_p + z * sigma_p)
 
     # ES
-    phi    = norm.pdf(z)
-    es_r   = -mu_p + sigma_p * phi / (1 - p)
-    es     = es_r * V0
+    phi = NormalDist().pdf(z)
+    es  = -mu_p + sigma_p * phi / (1 - p)
 
     return var, es
 
@@ -128,6 +136,32 @@ def historical_var_es(
     es  = losses[losses >= var].mean()
     return var, es
 
+def _mc_loss_sampler(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series],
+    mu_ann: Dict[str, float],
+    cov_ann: pd.DataFrame,
+    horizon_days: int,
+    trading_days: int,
+    seed: Optional[int]
+) -> Callable[[int], np.ndarray]:
+    # returns draw_losses(n): n simulated portfolio losses in dollars
+    rng       = np.random.default_rng(seed)
+    w, V0     = compute_weights(positions, price_series)
+    syms      = list(positions.keys())
+
+    mu_daily  = np.array([mu_ann[s] / trading_days for s in syms])
+    cov_daily = cov_ann.loc[syms, syms] / trading_days
+    mu_h      = mu_daily * horizon_days
+    cov_h     = cov_daily.values * horizon_days
+
+    def draw_losses(n):
+        sims      = rng.multivariate_normal(mu_h, cov_h, size=n)
+        port_rets = sims.dot(w)
+        return -port_rets * V0
+
+    return draw_losses
+
 def monte_carlo_var_es(
     positions: Dict[str, float],
     price_series: Dict[str, pd.Series],
@@ -175,19 +209,45 @@ def monte_carlo_var_es(
     ValueError
         If covariance matrix is not positive definite.
     """
-    rng       = np.random.default_rng(seed)
-    w, V0     = compute_weights(positions, price_series)
-    syms      = list(positions.keys())
-
-    mu_daily  = np.array([mu_ann[s] / trading_days for s in syms])
-    cov_daily = cov_ann.loc[syms, syms] / trading_days
-    mu_h      = mu_daily * horizon_days
-    cov_h     = cov_daily.values * horizon_days
-
-    sims      = rng.multivariate_normal(mu_h, cov_h, size=n_sims)
-    port_rets = sims.dot(w)
-    losses    = -port_rets * V0
-
+    draw_losses = _mc_loss_sampler(positions, price_series, mu_ann, cov_ann,
+                                   horizon_days, trading_days, seed)
+    losses = draw_losses(n_sims)
     var = np.quantile(losses, p)
     es  = losses[losses >= var].mean()
     return var, es
+
+def monte_carlo_var_es_adaptive(
+    positions: Dict[str, float],
+    price_series: Dict[str, pd.Series],
+    mu_ann: Dict[str, float],
+    cov_ann: pd.DataFrame,
+    p: float = P_VAR,
+    horizon_days: int = HORIZON_DAYS,
+    trading_days: int = TRADING_DAYS_YR,
+    seed: int = SEED,
+    rel_tol: Optional[float] = None,
+    abs_tol: Optional[float] = None,
+    batch_size: int = MC_BATCH_PATHS,
+    max_paths: int = MC_MAX_PATHS
+) -> MCEstimate:
+    """
+    `monte_carlo_var_es` with an adaptive path count.
+
+    Paths are simulated in batches of `batch_size` until the standard errors
+    of both VaR and ES meet `rel_tol` / `abs_tol` or `max_paths` is hit; see
+    `adaptive_tail_estimate`.  The other parameters are as in
+    `monte_carlo_var_es`.
+
+    Returns
+    -------
+    MCEstimate
+        VaR, ES, paths used and achieved standard errors.
+
+    Raises
+    ------
+    ValueError
+        If neither tolerance is given or the batch/budget sizes are invalid.
+    """
+    draw_losses = _mc_loss_sampler(positions, price_series, mu_ann, cov_ann,
+                                   horizon_days, trading_days, seed)
+    return adaptive_tail_estimate(draw_losses, p, rel_tol, abs_tol, batch_size, max_paths)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_project.attribution import (
+    parametric_attribution, historical_attribution, monte_carlo_attribution
+)
+from risk_project.var_es import parametric_var_es, monte_carlo_var_es
+
+SYMS = ["A", "B", "C"]
+
+def make_inputs(n=500):
+    rng    = np.random.default_rng(1)
+    dates  = pd.date_range("2020-01-01", periods=n)
+    rets   = rng.normal(0.0, [0.01, 0.02, 0.015], size=(n, 3))
+    prices = 100 * np.exp(np.cumsum(rets, axis=0))
+    series = {s: pd.Series(prices[:, j], index=dates) for j, s in enumerate(SYMS)}
+    # one short position to exercise negative exposures
+    positions = {"A": 10.0, "B": -5.0, "C": 8.0}
+    mu  = {s: 0.05 for s in SYMS}
+    cov = pd.DataFrame(np.cov(rets.T) * 252, index=SYMS, columns=SYMS)
+    return series, positions, mu, cov
+
+@pytest.mark.parametrize("book", [None, {"A": -10.0, "B": 2.0, "C": 0.0}])
+def test_parametric_components_sum_to_portfolio(book):
+    # the default book is net long; the second is net short
+    series, positions, mu, cov = make_inputs()
+    positions = book or positions
+    var, es = parametric_var_es(positions, series, mu, cov, p=0.99)
+    att = parametric_attribution(positions, series, mu, cov, p=0.99)
+    assert list(att.index) == SYMS
+    assert var > 0 and es > var
+    assert pytest.approx(att["component_var"].sum(), rel=1e-10) == var
+    assert pytest.approx(att["component_es"].sum(),  rel=1e-10) == es
+
+def test_parametric_incremental_is_var_without_position():
+    series, positions, mu, cov = make_inputs()
+    var, _ = parametric_var_es(positions, series, mu, cov, p=0.99)
+    var_rest, _ = parametric_var_es({"B": -5.0, "C": 8.0}, series, mu, cov, p=0.99)
+    att = parametric_attribution(positions, series, mu, cov, p=0.99)
+    assert pytest.approx(att.loc["A", "incremental_var"], rel=1e-10) == var - var_rest
+
+def test_monte_carlo_components_match_monte_carlo_var_es():
+    series, positions, mu, cov = make_inputs()
+    var, es = monte_carlo_var_es(positions, series, mu, cov, p=0.99, n_sims=5000, seed=7)
+    att = monte_carlo_attribution(positions, series, mu, cov, p=0.99, n_sims=5000, seed=7)
+    assert pytest.approx(att["component_var"].sum(), rel=1e-10) == var
+    assert pytest.approx(att["component_es"].sum(),  rel=1e-10) == es
+    # Euler components agree with the analytic ones up to MC noise
+    ana = parametric_attribution(positions, series, mu, cov, p=0.99)
+    np.testing.assert_allclose(att["component_es"], ana["component_es"],
+                               atol=0.2 * ana["component_es"].abs().max())
+
+def test_historical_es_components_are_tail_means():
+    series, positions, mu, cov = make_inputs()
+    att = historical_attribution(positions, series, p=0.95)
+    df  = pd.DataFrame(series)
+    pnl = df.diff().multiply(pd.Series(positions)).dropna()
+    losses = -pnl.sum(axis=1)
+    var = losses.quantile(0.95)
+    assert pytest.approx(att["component_es"].sum()) == losses[losses >= var].mean()
+    assert pytest.approx(att["component_var"].sum()) == var
+    np.testing.assert_allclose(att["marginal_es"] * att["exposure"], att["component_es"])
+
+def test_dollar_neutral_book_is_attributed():
+    series, _, mu, cov = make_inputs()
+    # +$1000 of A against -$1000 of B: net value V0 = 0
+    positions = {"A": 1000 / series["A"].iloc[-1], "B": -1000 / series["B"].iloc[-1]}
+    cov2 = cov.loc[["A", "B"], ["A", "B"]]
+    for att in (
+        parametric_attribution(positions, series, mu, cov2, p=0.99),
+        monte_carlo_attribution(positions, series, mu, cov2, p=0.99, n_sims=5000, seed=1),
+        historical_attribution(positions, series, p=0.95),
+    ):
+        assert np.isfinite(att.values).all()
+        np.testing.assert_allclose(att["exposure"], [1000.0, -1000.0])
+        assert att["component_var"].sum() > 0
+        assert att["component_es"].sum() >= att["component_var"].sum()
+    var, es = parametric_var_es(positions, series, mu, cov2, p=0.99)
+    att = parametric_attribution(positions, series, mu, cov2, p=0.99)
+    assert pytest.approx(att["component_var"].sum(), rel=1e-10) == var
+    assert pytest.approx(att["component_es"].sum(),  rel=1e-10) == es
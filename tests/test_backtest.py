@@ -35,3 +35,81 @@ def test_kupiec_no_exceptions_yields_p1():
     lr_stat, p_val = kupiec_test(0, 10, p=0.99)
     assert lr_stat >= 0
     assert pytest.approx(p_val, abs=1e-8) == 1.0
+
+def make_price_df(n=80):
+    rng   = np.random.default_rng(3)
+    dates = pd.date_range("2020-01-01", periods=n)
+    rets  = rng.normal(0.0, 0.01, size=(n, 2))
+    return pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=dates,
+                        columns=["A", "B"])
+
+def test_rolling_backtest_resumes_from_store(tmp_path, monkeypatch):
+    import risk_project.backtest as bt
+    df  = make_price_df()
+    pos = {"A": 1.0, "B": 2.0}
+    kw  = dict(method="parametric", p=0.95, window=20, store_dir=str(tmp_path),
+               checkpoint_every=7)
+    full = bt.rolling_backtest(df, pos, p=0.95, window=20)
+
+    bt.rolling_backtest(df.iloc[:60], pos, **kw)
+    calls = []
+    real  = bt._risk_on_window
+    monkeypatch.setattr(bt, "_risk_on_window", lambda *a: calls.append(1) or real(*a))
+    res = bt.rolling_backtest(df, pos, **kw)
+    # only the 20 appended dates are recomputed
+    assert len(calls) == 20
+    pd.testing.assert_frame_equal(res, full)
+
+    # a half-written record (interrupted run) is discarded on reopen
+    path = bt.BacktestStore(str(tmp_path), "portfolio", "parametric", 0.95, 1, 20).path
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 5)
+    calls.clear()
+    pd.testing.assert_frame_equal(bt.rolling_backtest(df, pos, **kw), full)
+    assert len(calls) == 0
+
+def test_rolling_backtest_recomputes_after_revision(tmp_path):
+    from risk_project.backtest import rolling_backtest
+    df  = make_price_df()
+    pos = {"A": 1.0, "B": 2.0}
+    kw  = dict(p=0.95, window=20, store_dir=str(tmp_path))
+    rolling_backtest(df, pos, **kw)
+    revised = df.copy()
+    revised.iloc[50, 0] *= 1.1
+    res = rolling_backtest(revised, pos, **kw)
+    pd.testing.assert_frame_equal(res, rolling_backtest(revised, pos, p=0.95, window=20))
+
+def test_rolling_backtest_resets_corrupt_store(tmp_path):
+    from risk_project.backtest import rolling_backtest, BacktestStore
+    import struct
+    df  = make_price_df()
+    pos = {"A": 1.0, "B": 2.0}
+    path = BacktestStore(str(tmp_path), "portfolio", "parametric", 0.95, 1, 20).path
+    # valid prefix announcing a 10-byte header that is not valid JSON
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sHI", b"RPBT", 1, 10) + b'{"symbols"')
+    res = rolling_backtest(df, pos, p=0.95, window=20, store_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(res, rolling_backtest(df, pos, p=0.95, window=20))
+
+def test_parametric_backtest_of_short_book(tmp_path):
+    from risk_project.backtest import rolling_backtest, BacktestStore, RECORD_DTYPE
+    from risk_project.results_store import price_chain
+    df  = make_price_df()
+    pos = {"A": -3.0, "B": 1.0}     # net short
+    kw  = dict(p=0.95, window=20)
+
+    # results left by older code (negative VaR, every date an exception)
+    store = BacktestStore(str(tmp_path), "portfolio", "parametric", 0.95, 1, 20)
+    store.open({"symbols": ["A", "B"], "positions": [-3.0, 1.0], "trading_days": 252,
+                "n_sims": None, "seed": None})
+    stale = np.zeros(5, dtype=RECORD_DTYPE)
+    stale["date"]  = df.index[20:25].values.astype("datetime64[ns]").view(np.int64)
+    stale["chain"] = price_chain(df[["A", "B"]])[20:25]
+    stale["var"], stale["exception"] = -1.0, 1
+    store.append(stale)
+
+    res = rolling_backtest(df, pos, store_dir=str(tmp_path), **kw)
+    pd.testing.assert_frame_equal(res, rolling_backtest(df, pos, **kw))
+    assert (res["var"] > 0).all() and (res["es"] > res["var"]).all()
+    assert (res["exception"] == (-res["pnl"] > res["var"])).all()
+    assert res["exception"].mean() < 0.25
@@ -0,0 +1,108 @@
+import os
+import csv
+import json
+import subprocess
+import sys
+import pytest
+
+from risk_project.cli import main, load_job_file
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+def write_jobs(tmp_path, jobs):
+    spec = {
+        "files": [os.path.join(PROJECT_ROOT, "data", f)
+                  for f in ("AAPL-bloomberg.csv", "AMZN-bloomberg.csv")],
+        "portfolios": {"equal": {"notional": {"AAPL": 100000, "AMZN": 100000}}},
+        "jobs": jobs,
+    }
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+def loaded_modules(args):
+    # run the CLI in a fresh interpreter and report which heavy modules it imported
+    code = (
+        "import sys\n"
+        "from risk_project.cli import main\n"
+        "try:\n"
+        f"    main({args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stderr.write(repr(sorted(m for m in ('numpy', 'pandas', 'scipy.stats') if m in sys.modules)))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return out.stderr.strip().splitlines()[-1]
+
+def test_help_and_parametric_jobs_skip_heavy_imports(tmp_path):
+    assert loaded_modules(["--help"]) == "[]"
+    path = write_jobs(tmp_path, [{"portfolio": "equal", "methods": ["parametric"]}])
+    assert loaded_modules([path, "-o", str(tmp_path / "out.json")]) == "['numpy', 'pandas']"
+
+def run_timed(args):
+    # --timings line of a CLI run in a fresh interpreter
+    out = subprocess.run([sys.executable, "-m", "risk_project.cli", *args, "--timings"],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stderr.strip().splitlines()[-1])
+
+def test_timings_cover_startup_and_skip_scipy(tmp_path):
+    path = write_jobs(tmp_path, [{"portfolio": "equal", "methods": ["parametric"]}])
+    timings = run_timed([path, "-o", str(tmp_path / "out.json")])
+    assert timings["jobs"] == 1
+    assert 0 < timings["startup_s"] <= timings["total_s"]
+    assert timings["pandas_loaded"] and not timings["scipy_stats_loaded"]
+
+# start-up ceiling (interpreter + imports + argparse, before any job runs);
+# wall-clock, so only enforced when benchmarking: RISK_BENCH=1 pytest ...
+STARTUP_BUDGET_S = 1.0
+
+@pytest.mark.skipif(not os.environ.get("RISK_BENCH"), reason="set RISK_BENCH=1 to benchmark")
+def test_startup_time_within_budget(tmp_path):
+    path = write_jobs(tmp_path, [{"portfolio": "equal", "methods": ["parametric"]}])
+    startups = [run_timed([path, "-o", str(tmp_path / "out.json")])["startup_s"]
+                for _ in range(3)]
+    print(f"risk-batch startup_s: {startups}")
+    assert min(startups) < STARTUP_BUDGET_S
+
+def test_batch_run_writes_csv(tmp_path):
+    path = write_jobs(tmp_path, [{"portfolio": "equal", "methods": ["parametric", "historical"],
+                                  "p": [0.99, 0.975], "horizons": [1, 5]}])
+    out = tmp_path / "out.csv"
+    assert main([path, "-o", str(out)]) == 0
+    rows = list(csv.DictReader(out.open()))
+    assert len(rows) == 8
+    assert {r["method"] for r in rows} == {"parametric", "historical"}
+    assert all(float(r["var"]) > 0 and float(r["es"]) >= float(r["var"]) for r in rows)
+
+def test_bad_job_file_is_rejected(tmp_path, capsys):
+    path = write_jobs(tmp_path, [{"portfolio": "equal", "methods": ["garch"]}])
+    with pytest.raises(ValueError):
+        load_job_file(path)
+    assert main([path]) == 1
+    assert "unknown method" in capsys.readouterr().err
+
+def test_job_file_shape_and_relative_files(tmp_path, capsys):
+    path = write_jobs(tmp_path, ["equal"])
+    assert main([path]) == 1
+    assert "job 0: expected an object" in capsys.readouterr().err
+
+    # relative files resolve against the job file, not the working directory
+    spec = json.loads(open(write_jobs(tmp_path, [{"portfolio": "equal"}])).read())
+    absolute = spec["files"]
+    spec["files"] = [os.path.relpath(f, tmp_path) for f in absolute]
+    (tmp_path / "jobs.json").write_text(json.dumps(spec))
+    assert load_job_file(str(tmp_path / "jobs.json"))["files"] == absolute
+
+def test_short_book_has_positive_parametric_var(tmp_path):
+    path = write_jobs(tmp_path, [{"portfolio": "short",
+                                  "methods": ["parametric", "historical"]}])
+    spec = json.loads(open(path).read())
+    spec["portfolios"]["short"] = {"shares": {"AAPL": -100}}
+    (tmp_path / "jobs.json").write_text(json.dumps(spec))
+    out = tmp_path / "out.json"
+    assert main([path, "-o", str(out)]) == 0
+    rows = {r["method"]: r for r in json.loads(out.read_text())}
+    assert rows["parametric"]["var"] > 0
+    assert rows["parametric"]["es"] > rows["parametric"]["var"]
+    # same order of magnitude as the historical estimate
+    assert 0.5 < rows["parametric"]["var"] / rows["historical"]["var"] < 2
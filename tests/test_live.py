@@ -0,0 +1,176 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_project.calibration import estimate_mu_sigma, estimate_covariance_matrix
+from risk_project.live import (
+    LiveRiskService, RollingCalibration, serve_bar_socket, tail_bloomberg_csv
+)
+from risk_project.var_es import parametric_var_es
+
+def make_price_df(n=60):
+    rng   = np.random.default_rng(5)
+    dates = pd.date_range("2024-01-01", periods=n)
+    rets  = rng.normal(0.0, 0.01, size=(n, 2))
+    return pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=dates,
+                        columns=["A", "B"])
+
+def test_rolling_calibration_matches_batch_estimates():
+    df   = make_price_df()
+    rets = np.log(df / df.shift(1)).dropna().values
+    cal  = RollingCalibration(2, capacity=19)
+    for r in rets[:-1]:
+        cal.push(r)
+    cal.push(rets[-1] + 0.05)
+    cal.replace_last(rets[-1])     # intraday revision back to the close
+    mu, cov = cal.estimate()
+    tail = df.iloc[-20:]
+    assert pytest.approx(mu[0]) == estimate_mu_sigma(tail["A"])[0]
+    np.testing.assert_allclose(cov, estimate_covariance_matrix(tail.to_dict("series")).values)
+
+async def http_get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), json.loads(body)
+
+def test_live_service_updates_from_appended_csv(tmp_path):
+    df   = make_price_df()
+    seed = df.iloc[:-1]
+    path = tmp_path / "A-bloomberg.csv"
+    path.write_text("Dates,PX_LAST,PX_OPEN\n")
+
+    async def scenario():
+        with ThreadPoolExecutor(2) as pool:
+            svc = LiveRiskService(["A", "B"], window=30, p=0.99, executor=pool,
+                                  coalesce_ms=30)
+            svc.seed(seed)
+            svc.register_portfolio("book", {"A": 3.0, "B": 2.0})
+            http = await svc.serve_http(port=0)
+            port = http.sockets[0].getsockname()[1]
+            loop_task = asyncio.ensure_future(svc.run_recompute_loop())
+            feed_task = asyncio.ensure_future(
+                svc.consume(tail_bloomberg_csv(str(path), "A", poll_interval=0.005)))
+            await asyncio.sleep(0.1)
+            n_before = svc.n_recomputes
+
+            # a burst of intraday ticks for the new date, ending at the close
+            last = df.index[-1]
+            with open(path, "a") as f:
+                for px in (99.0, 101.0, df["A"].iloc[-1]):
+                    f.write(f"{last.month}/{last.day}/{last.year},{px},0\n")
+            svc.on_bar("B", last.date(), df["B"].iloc[-1])
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if svc.as_of == last.date() and not svc.health()["pending"] \
+                        and svc.health()["bars"] == 4:
+                    break
+            await asyncio.sleep(0.1)
+            status, risk = await http_get(port, "/risk")
+            _, lat = await http_get(port, "/latency")
+            missing, _ = await http_get(port, "/nope")
+            for t in (loop_task, feed_task):
+                t.cancel()
+            http.close()
+            return svc, n_before, status, risk, lat, missing
+
+    svc, n_before, status, risk, lat, missing = asyncio.run(scenario())
+    assert status.endswith("200 OK") and missing.endswith("404 Not Found")
+    assert svc.n_bars == 4
+    # the burst was coalesced into far fewer recomputes than bars
+    assert svc.n_recomputes - n_before <= 2
+    assert lat["latency_ms"]["count"] >= 1
+
+    tail = df.iloc[-30:]
+    mu   = {s: estimate_mu_sigma(tail[s])[0] for s in tail}
+    cov  = estimate_covariance_matrix(tail.to_dict("series"))
+    var, es = parametric_var_es({"A": 3.0, "B": 2.0}, tail.to_dict("series"), mu, cov, p=0.99)
+    got = risk["portfolios"]["book"]["parametric"]
+    assert risk["as_of"] == df.index[-1].date().isoformat()
+    assert pytest.approx(got["var"], rel=1e-9) == var
+    assert pytest.approx(got["es"],  rel=1e-9) == es
+
+def test_tail_from_offset_keeps_rows_appended_after_seeding(tmp_path):
+    path = tmp_path / "A-bloomberg.csv"
+    path.write_text("Dates,PX_LAST\n1/2/2024,100.0\n1/3/2024,10")
+    seeded_size = path.stat().st_size      # mid-way through the last row
+
+    async def scenario():
+        feed = tail_bloomberg_csv(str(path), "A", poll_interval=0.005,
+                                  offset=seeded_size)
+        with open(path, "a") as f:
+            f.write("1.5\n1/4/2024,102.0\n")
+        return [await asyncio.wait_for(feed.__anext__(), 5) for _ in range(2)]
+
+    bars = asyncio.run(scenario())
+    assert [(b[1].isoformat(), b[2]) for b in bars] == [
+        ("2024-01-03", 101.5), ("2024-01-04", 102.0)
+    ]
+
+def test_socket_feed_with_default_process_pool():
+    # default executor: a spawn process pool, as used by risk-live
+    df   = make_price_df()
+    last = df.index[-1]
+
+    async def scenario():
+        svc = LiveRiskService(["A", "B"], window=30, coalesce_ms=10)
+        try:
+            svc.seed(df.iloc[:-1])
+            svc.register_portfolio("book", {"A": 3.0, "B": 2.0})
+            feed = await serve_bar_socket(svc, port=0)
+            port = feed.sockets[0].getsockname()[1]
+            loop_task = asyncio.ensure_future(svc.run_recompute_loop())
+
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            for s in ("A", "B"):
+                writer.write(f"{s},{last.month}/{last.day}/{last.year},{df[s].iloc[-1]},0\n"
+                             .encode())
+            await writer.drain()
+            writer.close()
+            for _ in range(300):
+                await asyncio.sleep(0.05)
+                if svc.as_of == last.date() and svc.n_bars == 2 \
+                        and not svc.health()["pending"]:
+                    break
+            loop_task.cancel()
+            feed.close()
+            return svc
+        finally:
+            svc.close(wait=True)
+
+    svc = asyncio.run(scenario())
+    assert svc.last_error is None
+    assert svc.as_of == last.date() and svc.n_bars == 2
+    got = svc.results["book"]["historical"]
+    assert got["es"] >= got["var"] > 0
+
+def test_idle_http_client_is_dropped_and_small_window_rejected():
+    with pytest.raises(ValueError):
+        LiveRiskService(["A", "B"], window=2, executor=ThreadPoolExecutor(1))
+
+    async def scenario():
+        with ThreadPoolExecutor(1) as pool:
+            svc = LiveRiskService(["A", "B"], window=3, executor=pool,
+                                  request_timeout_ms=100)
+            svc.seed(make_price_df())
+            http = await svc.serve_http(port=0)
+            port = http.sockets[0].getsockname()[1]
+            # connects, starts a request and never finishes the headers
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /health HTTP/1.1\r\n")
+            await writer.drain()
+            dropped = await asyncio.wait_for(reader.read(), 5)
+            status, health = await http_get(port, "/health")
+            writer.close()
+            http.close()
+            return dropped, status, health
+
+    dropped, status, health = asyncio.run(scenario())
+    assert dropped == b""
+    assert status.endswith("200 OK") and health["window_rows"] == 3
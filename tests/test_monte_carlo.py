@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 import pytest
-from risk_project.monte_carlo import monte_carlo
+from risk_project.monte_carlo import (
+    monte_carlo, monte_carlo_adaptive, adaptive_tail_estimate, tail_standard_errors
+)
 
 def make_series(n=300):
     dates   = pd.date_range("2020-01-01", periods=n)
@@ -49,3 +51,41 @@ def test_monte_carlo_es_short_constant_loss():
     expected = df["X"].iloc[idx] * 0.01
     # allow ~5% relative MC noise
     assert pytest.approx(es, rel=0.05) == expected
+
+def test_adaptive_monte_carlo_meets_tolerance():
+    from risk_project.var_es import monte_carlo_var_es_adaptive
+    dates  = pd.date_range("2020-01-01", periods=2)
+    series = {"X": pd.Series([100.0, 100.0], index=dates)}
+    cov    = pd.DataFrame([[0.04]], index=["X"], columns=["X"])
+    res = monte_carlo_var_es_adaptive({"X": 1.0}, series, {"X": 0.0}, cov, p=0.99,
+                                      seed=0, rel_tol=0.01, batch_size=2_000)
+    assert res.converged
+    assert res.var_se <= 0.01 * res.var and res.es_se <= 0.01 * res.es
+    assert res.n_paths % 2_000 == 0
+    # daily σ = 0.2/√252 → normal VaR ≈ 2.326 σ · 100
+    expected = 2.326348 * 0.2 / np.sqrt(252) * 100
+    assert pytest.approx(res.var, rel=0.04) == expected
+
+def test_adaptive_monte_carlo_respects_budget():
+    df  = pd.DataFrame({"X": 100 * np.exp(np.cumsum(
+        np.random.default_rng(0).normal(0, 0.02, 300)))})
+    res = monte_carlo_adaptive(df, {"X": 1.0}, idx=250, is_long=True, is_var=False,
+                               p=0.999, horizon_days=1, window=250, trading_days=252,
+                               seed=0, abs_tol=1e-9, batch_size=1_000, max_paths=3_000)
+    assert not res.converged
+    assert res.n_paths == 3_000
+
+def test_adaptive_tail_estimate_matches_full_sample():
+    # only the upper tail is retained between batches; the estimates must
+    # still equal those computed on every path
+    draws = np.random.default_rng(1).standard_normal(20_000)
+    it    = iter(np.split(draws, 10))
+    res   = adaptive_tail_estimate(lambda n: next(it), p=0.99, abs_tol=1e-12,
+                                   batch_size=2_000, max_paths=20_000)
+    assert res.n_paths == 20_000
+    assert np.allclose(res[:2] + res[3:5], tail_standard_errors(draws, 0.99))
+
+@pytest.mark.parametrize("bad", [{"batch_size": 0}, {"max_paths": 0}])
+def test_adaptive_tail_estimate_rejects_non_positive_sizes(bad):
+    with pytest.raises(ValueError):
+        adaptive_tail_estimate(np.ones, p=0.99, rel_tol=0.01, **bad)
@@ -0,0 +1,89 @@
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_project.data_loader import align_price_series
+from risk_project.shared_panel import SharedReturnPanel, init_worker, worker_panel
+
+def make_series():
+    dates = pd.date_range("2020-01-01", periods=6)
+    a = pd.Series([100.0, 101.0, 102.0, 103.0, 104.0, 105.0], index=dates)
+    # B has no print on the 3rd day
+    b = pd.Series([50.0, 51.0, 52.0, 53.0, 54.0], index=dates.delete(2))
+    return {"A": a, "B": b}
+
+def _log_return_sum(j):
+    return worker_panel().log_returns[:, j].sum()
+
+def test_align_price_series_policies():
+    series = make_series()
+    dropped = align_price_series(series, policy="drop")
+    assert len(dropped) == 5
+    filled = align_price_series(series, policy="ffill")
+    assert len(filled) == 6
+    assert filled["B"].iloc[2] == 51.0
+    with pytest.raises(ValueError):
+        align_price_series(series, policy="raise")
+
+def test_align_ffill_skips_gaps_longer_than_limit():
+    dates = pd.date_range("2020-01-01", periods=8)
+    a = pd.Series(np.arange(100.0, 108.0), index=dates)
+    # B misses one day (filled) and then three in a row (left out entirely)
+    b = pd.Series([50.0, 51.0, 53.0, 57.0], index=dates[[0, 1, 3, 7]])
+    out = align_price_series({"A": a, "B": b}, policy="ffill", ffill_limit=2)
+    assert list(out.index) == list(dates[[0, 1, 2, 3, 7]])
+    assert out["B"].iloc[2] == 51.0
+
+def test_align_keeps_last_price_of_duplicate_dates():
+    dates = pd.date_range("2020-01-01", periods=3)
+    a = pd.Series([100.0, 101.0, 102.0], index=dates)
+    # a corrected print for the second date appended after the original
+    b = pd.Series([50.0, 51.0, 52.0, 51.5], index=dates[[0, 1, 2, 1]])
+    for policy in ("drop", "ffill", "raise"):
+        out = align_price_series({"A": a, "B": b}, policy=policy)
+        assert list(out.index) == list(dates)
+        assert out["B"].iloc[1] == 51.5
+
+def test_shared_panel_returns_match_pandas():
+    price_df = align_price_series(make_series())
+    with SharedReturnPanel.create(price_df) as panel:
+        expected = np.log(price_df / price_df.shift(1)).dropna().values
+        np.testing.assert_allclose(panel.log_returns, expected)
+        np.testing.assert_allclose(panel.simple_returns,
+                                   price_df.pct_change().dropna().values)
+        assert panel.dates.equals(price_df.index)
+        assert panel.symbols == ("A", "B")
+    assert panel.closed
+    # owner unlinked the segment
+    with pytest.raises(FileNotFoundError):
+        SharedReturnPanel.attach(panel.spec)
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="needs fork")
+def test_pool_workers_attach_without_copy():
+    price_df = align_price_series(make_series())
+    with SharedReturnPanel.create(price_df) as panel:
+        ctx = mp.get_context("fork")
+        with ctx.Pool(2, initializer=init_worker, initargs=(panel.spec,)) as pool:
+            sums = pool.map(_log_return_sum, range(2))
+        np.testing.assert_allclose(sums, panel.log_returns.sum(axis=0))
+
+def test_attached_panel_is_read_only(monkeypatch):
+    import risk_project.shared_panel as sp
+    price_df = align_price_series(make_series())
+    with SharedReturnPanel.create(price_df) as panel:
+        with SharedReturnPanel.attach(panel.spec) as view:
+            for arr in (view.prices, view.log_returns, view.simple_returns):
+                with pytest.raises(ValueError):
+                    arr[0] = 0.0
+            np.testing.assert_array_equal(view.prices, price_df.values)
+        panel.prices[0, 0] = panel.prices[0, 0]     # owner stays writable
+
+        # a spec that does not fit the segment releases it before raising
+        released = []
+        real = sp._release
+        monkeypatch.setattr(sp, "_release",
+                            lambda shm, owner: released.append(owner) or real(shm, owner))
+        with pytest.raises(TypeError, match="too small"):
+            SharedReturnPanel.attach(panel.spec._replace(n_dates=10**6))
+        assert released == [False]